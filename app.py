@@ -1,114 +1,1715 @@
+import argparse
+import csv
+import glob
+import gzip
+import hashlib
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 import customtkinter as ctk
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, FieldType, pooling
 import pandas as pd
 from tkinter import filedialog, messagebox
 import tkinter.ttk as ttk
+from query_stats import estimate_bytes, registry as query_stats
+
+# Connection pool defaults
+POOL_SIZE = 4
+PING_INTERVAL = 30  # seconds a connection may sit idle before it is pinged
+
+# Metadata cache bounds
+METADATA_TTL = 300  # seconds
+METADATA_MAX_ENTRIES = 64
+
+# Maximum keys per "WHERE key IN (...)" statement for batched edits
+KEY_BATCH_SIZE = 1000
+
+# Explorer filter operators; NULL checks take no value, IN takes a comma list
+FILTER_OPERATORS = ("=", "!=", "<", "<=", ">", ">=", "LIKE", "NOT LIKE", "IN",
+                    "IS NULL", "IS NOT NULL")
+
+# Rows pulled from the server per fetchmany() when exporting
+EXPORT_BATCH_SIZE = 10000
+EXPORT_FORMATS = {".csv": "csv", ".gz": "csv.gz", ".parquet": "parquet"}
+
+# SQL console limits
+QUERY_MAX_ROWS = 10000
+QUERY_FETCH_SIZE = 1000
+QUERY_HISTORY_SIZE = 50
+QUERY_HISTORY_MAX_ROWS = 200000  # across all cached results
+
+# Bookkeeping table used to resume interrupted CSV imports
+IMPORT_PROGRESS_TABLE = "_csv_import_progress"
+
+# Sync (upsert) imports keep a hash of each row's CSV values next to the data
+ROW_HASH_COLUMN = "_row_hash"
+# Per-connection temporary table each chunk's keys are diffed through
+SYNC_CHUNK_TABLE = "_sync_chunk"
+
+# Batch (multi-file) imports
+CSV_PATTERNS = ("*.csv", "*.csv.gz")
+TABLE_MAPPINGS = {"File name": "stem", "Single table": "single", "Regex on file name": "regex"}
+MAX_REPORTED_ERRORS = 20
+
+# Type inference limits for CSV imports
+INTEGER_TYPES = [
+    ("TINYINT", -2**7, 2**7 - 1),
+    ("SMALLINT", -2**15, 2**15 - 1),
+    ("MEDIUMINT", -2**23, 2**23 - 1),
+    ("INT", -2**31, 2**31 - 1),
+    ("BIGINT", -2**63, 2**63 - 1),
+]
+MAX_DECIMAL_SCALE = 8
+MAX_DECIMAL_PRECISION = 15  # digits a float64 holds exactly
+MAX_VARCHAR_LENGTH = 16383  # utf8mb4 row-size limit
+ENUM_MAX_VALUES = 16
+ENUM_MIN_ROWS_PER_VALUE = 10
+DATETIME_PATTERN = r"^\d{4}-\d{1,2}-\d{1,2}(?:[ T](\d{1,2}:\d{2}(?::\d{2}(\.\d+)?)?))?$"
+KIND_ORDER = {"bool": 0, "int": 1, "float": 2}
+
+def quote_identifier(name):
+    return "`" + str(name).replace("`", "``") + "`"
+
+def quote_literal(value):
+    return "'" + str(value).replace("\\", "\\\\").replace("'", "''") + "'"
+
+def to_db_value(value):
+    # NaN/NaT become NULL and numpy scalars become plain Python values
+    if pd.isna(value):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+def new_column_stats():
+    return {"count": 0, "nulls": 0, "kind": None, "min": None, "max": None,
+            "scale": 0, "max_len": 0, "values": set(), "has_time": False,
+            "has_fraction": False}
+
+def _series_stats(values):
+    stats = new_column_stats()
+    stats["count"] = len(values)
+    stats["max_len"] = int(values.astype(str).str.len().max())
+    if pd.api.types.is_bool_dtype(values):
+        stats.update(kind="bool", min=0, max=1)
+    elif pd.api.types.is_numeric_dtype(values):
+        integral = bool((values % 1 == 0).all())
+        stats.update(kind="int" if integral else "float",
+                     min=values.min().item(), max=values.max().item())
+        if not integral:
+            # Smallest scale that represents every value exactly, if any
+            stats["scale"] = None
+            for scale in range(1, MAX_DECIMAL_SCALE + 1):
+                if (values.round(scale) == values).all():
+                    stats["scale"] = scale
+                    break
+    else:
+        text = values.astype(str)
+        parts = text.str.extract(DATETIME_PATTERN)
+        if text.str.match(DATETIME_PATTERN).all():
+            stats.update(kind="datetime", has_time=bool(parts[0].notna().any()),
+                         has_fraction=bool(parts[1].notna().any()))
+        else:
+            stats["kind"] = "string"
+    uniques = values.unique()
+    stats["values"] = set(uniques.tolist()) if len(uniques) <= ENUM_MAX_VALUES else None
+    return stats
+
+def merge_column_stats(total, stats):
+    if stats["count"] == 0:
+        total["nulls"] += stats["nulls"]
+        return total
+    if total["count"] == 0:
+        merged = dict(stats)
+        merged["nulls"] += total["nulls"]
+        return merged
+
+    kinds = {total["kind"], stats["kind"]}
+    if kinds == {"datetime"}:
+        kind = "datetime"
+    elif kinds <= set(KIND_ORDER):
+        kind = max(kinds, key=KIND_ORDER.get)
+    else:
+        kind = "string"
+    if total["values"] is None or stats["values"] is None:
+        values = None
+    else:
+        values = total["values"] | stats["values"]
+        if len(values) > ENUM_MAX_VALUES:
+            values = None
+    scale = None
+    if total["scale"] is not None and stats["scale"] is not None:
+        scale = max(total["scale"], stats["scale"])
+    return {
+        "count": total["count"] + stats["count"],
+        "nulls": total["nulls"] + stats["nulls"],
+        "kind": kind,
+        "min": min(total["min"], stats["min"]) if kind in KIND_ORDER else None,
+        "max": max(total["max"], stats["max"]) if kind in KIND_ORDER else None,
+        "scale": scale,
+        "max_len": max(total["max_len"], stats["max_len"]),
+        "values": values,
+        "has_time": total["has_time"] or stats["has_time"],
+        "has_fraction": total["has_fraction"] or stats["has_fraction"],
+    }
+
+def collect_column_stats(df, stats=None):
+    stats = stats if stats is not None else {}
+    for col in df.columns:
+        series = df[col]
+        values = series.dropna()
+        chunk_stats = _series_stats(values) if len(values) else new_column_stats()
+        chunk_stats["nulls"] = len(series) - len(values)
+        stats[col] = merge_column_stats(stats.get(col, new_column_stats()), chunk_stats)
+    return stats
+
+def mysql_type_for(stats, use_enum=True):
+    kind = stats["kind"]
+    if stats["count"] == 0:
+        return "VARCHAR(255)"
+    if kind == "bool":
+        return "BOOLEAN"
+    if kind == "int":
+        for name, low, high in INTEGER_TYPES:
+            if low <= stats["min"] and stats["max"] <= high:
+                return name
+        return "DOUBLE"
+    if kind == "float":
+        # inf/-inf only fit a floating point column
+        if not (math.isfinite(stats["min"]) and math.isfinite(stats["max"])):
+            return "DOUBLE"
+        digits = len(str(int(max(abs(stats["min"]), abs(stats["max"])))))
+        if stats["scale"] is not None and digits + stats["scale"] <= MAX_DECIMAL_PRECISION:
+            return f"DECIMAL({digits + stats['scale']},{stats['scale']})"
+        return "DOUBLE"
+    if kind == "datetime":
+        if stats["has_fraction"]:
+            return "DATETIME(6)"
+        return "DATETIME" if stats["has_time"] else "DATE"
+    values = stats["values"]
+    # MySQL compares ENUM members under the (case-insensitive) collation
+    # and strips trailing spaces, so "Yes"/"yes" would be duplicates
+    if (use_enum and values is not None
+            and stats["count"] >= ENUM_MIN_ROWS_PER_VALUE * len(values)
+            and len({str(v).rstrip().casefold() for v in values}) == len(values)):
+        return f"ENUM({', '.join(quote_literal(v) for v in sorted(values, key=str))})"
+    if stats["max_len"] > MAX_VARCHAR_LENGTH:
+        return "MEDIUMTEXT"
+    return f"VARCHAR({max(stats['max_len'], 1)})"
+
+def scan_csv_stats(csv_path, sample_rows=None, chunk_size=100000):
+    stats = {}
+    for chunk in pd.read_csv(csv_path, chunksize=chunk_size, nrows=sample_rows):
+        collect_column_stats(chunk, stats)
+    if not stats:
+        stats = {col: new_column_stats() for col in pd.read_csv(csv_path, nrows=0).columns}
+    return stats
+
+def infer_csv_schema(csv_path, sample_rows=None, chunk_size=100000, use_enum=True):
+    # Scans the whole file unless sample_rows is given; parsing is cheap
+    # next to inserting, and a full scan guarantees every value fits
+    stats = scan_csv_stats(csv_path, sample_rows, chunk_size)
+    return [(col, mysql_type_for(col_stats, use_enum)) for col, col_stats in stats.items()]
+
+def row_hash(values):
+    # Fed the raw CSV fields: parsed values aren't stable, since pandas types
+    # each chunk on its own (an int column with a gap in the chunk is float)
+    text = "\x1f".join("\x00" if value is None else str(value) for value in values)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+def skip_parsed_rows(reader, count):
+    # Drops the first count rows of a chunked reader; fully skipped chunks
+    # come out empty so parallel readers stay in step
+    for chunk in reader:
+        if count:
+            dropped = min(count, len(chunk))
+            chunk = chunk.iloc[dropped:]
+            count -= dropped
+        yield chunk
+
+def sync_keys_table(table_name):
+    return f"{table_name}_sync_keys"[:64]
+
+def csv_sources(pattern):
+    # A directory means every CSV directly inside it, otherwise a glob
+    if os.path.isdir(pattern):
+        paths = [path for p in CSV_PATTERNS for path in glob.glob(os.path.join(pattern, p))]
+    else:
+        paths = glob.glob(pattern)
+    return sorted(path for path in paths if os.path.isfile(path))
+
+def csv_stem(path):
+    name = os.path.basename(path)
+    for suffix in (".gz", ".csv"):
+        if name.lower().endswith(suffix):
+            name = name[:-len(suffix)]
+    return name
+
+def shard_table_mapper(mode, value=""):
+    # Maps a shard's path to its target table:
+    #   stem    sales_2024.csv -> sales_2024
+    #   single  every file -> value
+    #   regex   the "table" group (or the first group, or the whole match)
+    #           of value searched in the file name, e.g. ^(?P<table>[a-z]+)_\d+
+    if mode == "single":
+        if not value:
+            raise ValueError("Enter the table every file is imported into")
+        return lambda path: value
+    if mode == "regex":
+        try:
+            pattern = re.compile(value)
+        except re.error as e:
+            raise ValueError(f"Invalid table pattern: {e}")
+        def table_for(path):
+            match = pattern.search(os.path.basename(path))
+            if match is None:
+                raise ValueError(f"File name does not match {value!r}")
+            if "table" in pattern.groupindex:
+                return match.group("table")
+            return match.group(1) if pattern.groups else match.group(0)
+        return table_for
+    return csv_stem
+
+def split_columns(text):
+    return [col.strip() for col in text.split(",") if col.strip()]
+
+def filter_clause(filters):
+    # (column, operator, value) triples ANDed into a parameterized condition
+    clauses = []
+    params = []
+    for column, operator, value in filters:
+        if operator not in FILTER_OPERATORS:
+            raise ValueError(f"Unsupported filter operator: {operator}")
+        col = quote_identifier(column)
+        if operator in ("IS NULL", "IS NOT NULL"):
+            clauses.append(f"{col} {operator}")
+        elif operator == "IN":
+            values = list(value) if isinstance(value, (list, tuple)) else split_columns(value)
+            if not values:
+                raise ValueError(f"IN on {column} needs at least one value")
+            clauses.append(f"{col} IN ({', '.join(['%s'] * len(values))})")
+            params.extend(values)
+        else:
+            clauses.append(f"{col} {operator} %s")
+            params.append(value)
+    return " AND ".join(clauses), params
+
+def key_part(column, dtype):
+    # TEXT columns can only be indexed on a prefix
+    return f"{quote_identifier(column)}(255)" if dtype.endswith("TEXT") else quote_identifier(column)
+
+def export_format(path):
+    fmt = EXPORT_FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ValueError(f"Unsupported export format for '{path}' "
+                         "(use .csv, .csv.gz or .parquet)")
+    return fmt
+
+class CsvExportWriter:
+    def __init__(self, path, columns, compress=False):
+        if compress:
+            self.file = gzip.open(path, "wt", newline="", encoding="utf-8")
+        else:
+            self.file = open(path, "w", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(columns)
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+class ParquetExportWriter:
+    # One row group per fetched batch. DECIMAL, TIME and text/blob columns
+    # are written as strings so values survive exactly.
+    def __init__(self, path, description):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet export requires pyarrow (pip install pyarrow)")
+        self.pa = pa
+        self.schema = pa.schema([(desc[0], self._arrow_type(desc[1])) for desc in description])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def _arrow_type(self, type_code):
+        pa = self.pa
+        if type_code in (FieldType.TINY, FieldType.SHORT, FieldType.LONG,
+                         FieldType.INT24, FieldType.LONGLONG, FieldType.YEAR):
+            return pa.int64()
+        if type_code in (FieldType.FLOAT, FieldType.DOUBLE):
+            return pa.float64()
+        if type_code == FieldType.DATE:
+            return pa.date32()
+        if type_code in (FieldType.DATETIME, FieldType.TIMESTAMP):
+            return pa.timestamp("us")
+        return pa.string()
+
+    def write(self, rows):
+        arrays = []
+        for values, field in zip(zip(*rows), self.schema):
+            if field.type == self.pa.string():
+                values = [
+                    value.decode("utf-8", "replace") if isinstance(value, (bytes, bytearray))
+                    else value if value is None or isinstance(value, str) else str(value)
+                    for value in values
+                ]
+            arrays.append(self.pa.array(values, type=field.type))
+        self.writer.write_table(self.pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+class MetadataCache:
+    # Thread-safe TTL + LRU map shared by all worker threads
+    def __init__(self, ttl=METADATA_TTL, max_entries=METADATA_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+class QueryHistory:
+    # LRU of recent console results, bounded by entry count and total rows,
+    # so a recent result can be shown again without a server round trip.
+    # Only touched from the Tk thread.
+    def __init__(self, max_entries=QUERY_HISTORY_SIZE, max_rows=QUERY_HISTORY_MAX_ROWS):
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self._entries = OrderedDict()
+        self._rows = 0
+
+    @staticmethod
+    def key(db_name, sql, params):
+        return (db_name, sql.strip(), repr(params))
+
+    def get(self, key):
+        result = self._entries.get(key)
+        if result is not None:
+            self._entries.move_to_end(key)
+        return result
+
+    def put(self, key, result):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._rows -= len(old["rows"])
+        self._entries[key] = result
+        self._rows += len(result["rows"])
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries
+                                          or self._rows > self.max_rows):
+            _, evicted = self._entries.popitem(last=False)
+            self._rows -= len(evicted["rows"])
+
+    def recent(self):
+        return list(reversed(self._entries.items()))
+
+    def clear(self):
+        self._entries.clear()
+        self._rows = 0
 
 class DatabaseManager:
-    def __init__(self):
-        self.connection = None
+    _pool_ids = itertools.count(1)
+
+    def __init__(self, pool_size=POOL_SIZE, ping_interval=PING_INTERVAL):
+        self.pool = None
+        self.config = None
+        self.pool_size = pool_size
+        self.ping_interval = ping_interval
+        self.metadata = MetadataCache()
+        self.stats = query_stats
+        self._local = threading.local()
         
     def connect(self, host, user, password):
         try:
-            self.connection = mysql.connector.connect(
-                host=host,
-                user=user,
-                password=password
+            self.config = {"host": host, "user": user, "password": password}
+            # Sessions are not reset on checkout so the tracked database holds
+            self.pool = pooling.MySQLConnectionPool(
+                pool_name=f"dbmanager-{next(self._pool_ids)}",
+                pool_size=self.pool_size,
+                pool_reset_session=False,
+                **self.config
             )
+            self.metadata.invalidate()
+            cursor = self._checkout().cursor()
+            sql_mode = self._query(cursor, "SELECT @@SESSION.sql_mode", one=True)[0]
+            cursor.close()
+            # Without ANSI_QUOTES, "..." is a string literal to MySQL
+            self.stats.double_quoted_strings = "ANSI_QUOTES" not in sql_mode.upper()
             return True, "Connected successfully!"
+        except Error as e:
+            self.pool = None
+            return False, f"Error: {e}"
+
+    @property
+    def connection(self):
+        return self._checkout() if self.pool else None
+
+    def _checkout(self, db_name=None):
+        # Each thread keeps one pooled connection and the database it last
+        # switched to, so repeated calls skip the USE round trip
+        local = self._local
+        now = time.monotonic()
+        if getattr(local, "pool", None) is not self.pool:
+            if getattr(local, "connection", None) is not None:
+                local.connection.close()
+            local.connection = self.pool.get_connection()
+            local.pool = self.pool
+            local.database = None
+        elif now - local.last_used > self.ping_interval:
+            try:
+                local.connection.ping()
+            except Error:
+                local.connection.reconnect(attempts=3, delay=1)
+                local.database = None
+        local.last_used = now
+
+        if db_name is not None and local.database != db_name:
+            cursor = local.connection.cursor()
+            self._execute(cursor, f"USE {quote_identifier(db_name)}")
+            cursor.close()
+            local.database = db_name
+        return local.connection
+
+    def connection_id(self):
+        return self._checkout().connection_id if self.pool else None
+
+    def _execute(self, cursor, query, params=None, many=False):
+        # Every statement is timed and counted in self.stats
+        started = time.perf_counter()
+        try:
+            if many:
+                cursor.executemany(query, params)
+            else:
+                cursor.execute(query, params)
+        except Error:
+            self.stats.record_query(query, time.perf_counter() - started, error=True)
+            raise
+        # Slow writes get a plan too; an executemany batch has no single one
+        self.stats.record_query(query, time.perf_counter() - started,
+                                rows=max(cursor.rowcount, 0),
+                                explain=None if many else lambda: self._explain(query, params))
+        return cursor
+
+    def _query(self, cursor, query, params=None, one=False):
+        # Like _execute but fetches, so rows and bytes can be recorded too
+        started = time.perf_counter()
+        try:
+            cursor.execute(query, params)
+            if one:
+                row = cursor.fetchone()
+                rows = [row] if row is not None else []
+                # Unbuffered cursors must be drained before the next statement
+                cursor.fetchall()
+            else:
+                rows = cursor.fetchall()
+        except Error:
+            self.stats.record_query(query, time.perf_counter() - started, error=True)
+            raise
+        self.stats.record_query(
+            query, time.perf_counter() - started, rows=len(rows), nbytes=estimate_bytes(rows),
+            explain=lambda: self._explain(query, params)
+        )
+        return rows[0] if one and rows else None if one else rows
+
+    def _explain(self, query, params):
+        if query.lstrip()[:6].upper() not in ("SELECT", "UPDATE", "DELETE", "INSERT", "REPLAC"):
+            return None
+        cursor = self._checkout().cursor(buffered=True)
+        try:
+            cursor.execute(f"EXPLAIN {query}", params)
+            columns = [desc[0] for desc in cursor.description]
+            return "\n".join(
+                ", ".join(f"{col}={value}" for col, value in zip(columns, row) if value is not None)
+                for row in cursor.fetchall()
+            )
+        finally:
+            cursor.close()
+
+    def kill_query(self, connection_id):
+        # KILL has to come from a second connection; the target one is busy
+        try:
+            connection = mysql.connector.connect(**self.config)
+            try:
+                connection.cursor().execute(f"KILL QUERY {int(connection_id)}")
+            finally:
+                connection.close()
+            return True, "Query cancelled"
         except Error as e:
             return False, f"Error: {e}"
     
     def create_database(self, db_name):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(f"CREATE DATABASE {db_name}")
+            cursor = self._checkout().cursor()
+            self._execute(cursor, f"CREATE DATABASE {db_name}")
+            self.metadata.invalidate("databases")
             return True, f"Database '{db_name}' created successfully!"
         except Error as e:
             return False, f"Error: {e}"
             
     def get_databases(self):
-        cursor = self.connection.cursor()
-        cursor.execute("SHOW DATABASES")
-        return [db[0] for db in cursor.fetchall()]
+        databases = self.metadata.get("databases")
+        if databases is None:
+            cursor = self._checkout().cursor()
+            databases = [db[0] for db in self._query(cursor, "SHOW DATABASES")]
+            self.metadata.put("databases", databases)
+        return databases
+
+    def get_schema(self, db_name):
+        schema = self.metadata.get(("schema", db_name))
+        if schema is None:
+            schema = self._load_schema(db_name)
+            self.metadata.put(("schema", db_name), schema)
+        return schema
+
+    def _load_schema(self, db_name):
+        # Tables, columns, unique keys and row estimates in one round trip
+        cursor = self._checkout().cursor()
+        rows = self._query(
+            cursor,
+            "SELECT c.TABLE_NAME, c.COLUMN_NAME, c.COLUMN_TYPE, c.IS_NULLABLE, "
+            "t.TABLE_ROWS, s.INDEX_NAME, s.SEQ_IN_INDEX "
+            "FROM information_schema.COLUMNS c "
+            "JOIN information_schema.TABLES t "
+            "ON t.TABLE_SCHEMA = c.TABLE_SCHEMA AND t.TABLE_NAME = c.TABLE_NAME "
+            "LEFT JOIN information_schema.STATISTICS s "
+            "ON s.TABLE_SCHEMA = c.TABLE_SCHEMA AND s.TABLE_NAME = c.TABLE_NAME "
+            "AND s.COLUMN_NAME = c.COLUMN_NAME AND s.NON_UNIQUE = 0 "
+            "WHERE c.TABLE_SCHEMA = %s "
+            "ORDER BY c.TABLE_NAME, c.ORDINAL_POSITION",
+            (db_name,)
+        )
+        schema = {}
+        for table, column, dtype, nullable, estimate, index_name, seq in rows:
+            info = schema.setdefault(table, {"columns": [], "types": {}, "nullable": set(),
+                                             "unique_keys": {}, "rows": estimate})
+            if column not in info["types"]:
+                info["columns"].append(column)
+                info["types"][column] = dtype
+                if nullable == "YES":
+                    info["nullable"].add(column)
+            if index_name is not None:
+                info["unique_keys"].setdefault(index_name, []).append((seq, column))
+        for info in schema.values():
+            info["unique_keys"] = {
+                name: [col for _, col in sorted(parts)]
+                for name, parts in info["unique_keys"].items()
+            }
+            info["primary_key"] = info["unique_keys"].get("PRIMARY", [])
+        return schema
+
+    def get_table_info(self, db_name, table_name):
+        return self.get_schema(db_name).get(table_name)
+
+    def invalidate_metadata(self, db_name=None):
+        if db_name is None:
+            self.metadata.invalidate()
+        else:
+            self.metadata.invalidate(("schema", db_name))
         
     def get_tables(self, db_name):
-        cursor = self.connection.cursor()
-        cursor.execute(f"USE {db_name}")
-        cursor.execute("SHOW TABLES")
-        return [table[0] for table in cursor.fetchall()]
+        return list(self.get_schema(db_name))
         
     def get_table_data(self, db_name, table_name):
-        cursor = self.connection.cursor()
-        cursor.execute(f"USE {db_name}")
-        cursor.execute(f"SELECT * FROM {table_name}")
+        connection = self._checkout(db_name)
+        cursor = connection.cursor()
+        data = self._query(cursor, f"SELECT * FROM {table_name}")
         columns = [desc[0] for desc in cursor.description]
-        data = cursor.fetchall()
         return columns, data
         
+    def get_primary_key(self, db_name, table_name):
+        info = self.get_table_info(db_name, table_name)
+        return info["primary_key"] if info else []
+
+    def get_table_page(self, db_name, table_name, limit, key_columns=(), after=None,
+                       before=None, offset=0, columns=None, filters=(), order_by=(),
+                       descending=False):
+        # Keyset paging on key_columns (e.g. sort column + primary key) when
+        # given, LIMIT/OFFSET in order_by order otherwise. Only the requested
+        # columns and the filtered rows leave the server.
+        connection = self._checkout(db_name)
+        cursor = connection.cursor()
+        select = "*" if not columns else ", ".join(quote_identifier(col) for col in columns)
+        query = f"SELECT {select} FROM {quote_identifier(table_name)}"
+        where, params = filter_clause(filters)
+        conditions = [where] if where else []
+        if key_columns:
+            keys = ", ".join(quote_identifier(col) for col in key_columns)
+            placeholders = ", ".join(["%s"] * len(key_columns))
+            # "before" scans backwards from the boundary and is reversed below
+            scan_descending = descending != (before is not None)
+            if after is not None or before is not None:
+                operator = "<" if scan_descending else ">"
+                conditions.append(f"({keys}) {operator} ({placeholders})")
+                params.extend(after if after is not None else before)
+            order_by = key_columns
+        else:
+            scan_descending = descending
+        if conditions:
+            query += " WHERE " + " AND ".join(f"({condition})" for condition in conditions)
+        if order_by:
+            direction = "DESC" if scan_descending else "ASC"
+            query += " ORDER BY " + ", ".join(f"{quote_identifier(col)} {direction}"
+                                              for col in order_by)
+        if key_columns:
+            query += " LIMIT %s"
+            params.append(limit)
+        else:
+            query += " LIMIT %s OFFSET %s"
+            params.extend([limit, offset])
+        rows = self._query(cursor, query, params)
+        columns = [desc[0] for desc in cursor.description]
+        if before is not None and key_columns:
+            rows.reverse()
+        return columns, rows
+
+    def run_query(self, db_name, sql, params=None, max_rows=QUERY_MAX_ROWS,
+                  fetch_size=QUERY_FETCH_SIZE, progress_callback=None, cancel_event=None):
+        # Streams rows with fetchmany() on an unbuffered cursor so memory is
+        # bounded by max_rows; past the cap the server-side query is killed
+        connection = self._checkout(db_name)
+        cursor = connection.cursor()
+        sql = sql.strip().rstrip(";")
+        params = params or None
+        explain = lambda: self._explain(sql, params)
+        started = time.perf_counter()
+        try:
+            try:
+                cursor.execute(sql, params)
+            except Error:
+                self.stats.record_query(sql, time.perf_counter() - started, error=True)
+                raise
+            if not cursor.with_rows:
+                rowcount = max(cursor.rowcount, 0)
+                self.stats.record_query(sql, time.perf_counter() - started, rows=rowcount,
+                                        explain=explain)
+                connection.commit()
+                self.invalidate_metadata(db_name)
+                return {"columns": [], "rows": [], "rowcount": rowcount, "truncated": False,
+                        "seconds": time.perf_counter() - started}
+
+            columns = [desc[0] for desc in cursor.description]
+            rows = []
+            truncated = False
+            try:
+                while True:
+                    if cancel_event is not None and cancel_event.is_set():
+                        truncated = True
+                        break
+                    batch = cursor.fetchmany(min(fetch_size, max_rows + 1 - len(rows)))
+                    if not batch:
+                        break
+                    rows.extend(batch)
+                    if len(rows) > max_rows:
+                        del rows[max_rows:]
+                        truncated = True
+                        break
+                    if progress_callback:
+                        progress_callback(len(rows))
+                if truncated:
+                    self._discard_results(connection)
+            except Error:
+                self.stats.record_query(sql, time.perf_counter() - started, error=True)
+                raise
+            seconds = time.perf_counter() - started
+            # Recorded once the result is drained: until then the unbuffered
+            # cursor holds the connection and EXPLAIN can't run on it
+            self.stats.record_query(sql, seconds, rows=len(rows), nbytes=estimate_bytes(rows),
+                                    explain=explain)
+            return {"columns": columns, "rows": rows, "rowcount": len(rows),
+                    "truncated": truncated, "seconds": seconds}
+        finally:
+            try:
+                cursor.close()
+            except Error:
+                pass
+            # The statement may have been a USE, so the tracked database is stale
+            self._local.database = None
+
+    def _discard_results(self, connection):
+        # Stop the server from sending the rest, then drop what is in flight
+        self.kill_query(connection.connection_id)
+        try:
+            connection.consume_results()
+        except Error:
+            pass
+
+    def explain_query(self, db_name, sql, params=None, analyze=False):
+        # EXPLAIN ANALYZE runs the statement, so it is limited to reads.
+        # MariaDB spells it ANALYZE <statement>.
+        sql = sql.strip().rstrip(";")
+        if analyze and sql.split(None, 1)[0].upper() not in ("SELECT", "WITH", "TABLE"):
+            raise ValueError("EXPLAIN ANALYZE is only available for SELECT statements")
+        connection = self._checkout(db_name)
+        if not analyze:
+            prefix = "EXPLAIN"
+        elif "mariadb" in connection.get_server_info().lower():
+            prefix = "ANALYZE"
+        else:
+            prefix = "EXPLAIN ANALYZE"
+        cursor = connection.cursor()
+        started = time.perf_counter()
+        try:
+            rows = self._query(cursor, f"{prefix} {sql}", params or None)
+            columns = [desc[0] for desc in cursor.description]
+        finally:
+            cursor.close()
+            self._local.database = None
+        return {"columns": columns, "rows": rows, "rowcount": len(rows), "truncated": False,
+                "seconds": time.perf_counter() - started}
+
     def create_table(self, db_name, table_name, columns):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(f"USE {db_name}")
+            connection = self._checkout(db_name)
+            cursor = connection.cursor()
             columns_str = ", ".join([f"{name} {dtype}" for name, dtype in columns])
-            cursor.execute(f"CREATE TABLE {table_name} ({columns_str})")
+            self._execute(cursor, f"CREATE TABLE {table_name} ({columns_str})")
+            self.invalidate_metadata(db_name)
             return True, f"Table '{table_name}' created successfully!"
         except Error as e:
             return False, f"Error: {e}"
             
-    def import_csv(self, db_name, table_name, csv_path):
+    def import_csv(self, db_name, table_name, csv_path, chunk_size=10000,
+                   progress_callback=None, resume=True, infer_types=True,
+                   sample_rows=None, primary_key=(), auto_id=False, indexes=(),
+                   cancel_event=None, sync_key=(), delete_missing=False):
+        # With sync_key, rows are upserted on that key instead of appended:
+        # only new or changed rows (by ROW_HASH_COLUMN) are written, and with
+        # delete_missing, rows whose key is absent from the file are removed
         try:
-            df = pd.read_csv(csv_path)
-            cursor = self.connection.cursor()
-            cursor.execute(f"USE {db_name}")
-            
+            connection = self._checkout(db_name)
+            cursor = connection.cursor()
+            table = quote_identifier(table_name)
+            sync_key = list(sync_key)
+            file_columns = list(pd.read_csv(csv_path, nrows=0).columns)
+            header = [col for col in file_columns if not (sync_key and col == ROW_HASH_COLUMN)]
+            columns = [quote_identifier(col) for col in header]
+            missing = [col for col in sync_key if col not in header]
+            if missing:
+                raise ValueError(f"Sync key column(s) not in the CSV: {', '.join(missing)}")
+
+            # Progress is keyed on the file's path, size and mtime so a changed
+            # file is never resumed at a stale offset
+            self._ensure_import_progress_table(cursor)
+            source_key = self._import_source_key(csv_path)
+            table_exists = self._table_exists(cursor, db_name, table_name)
+            rows_done = 0
+            if resume and table_exists:
+                rows_done = self._get_import_progress(cursor, table_name, source_key)
+            if rows_done and delete_missing and not self._table_exists(
+                    cursor, db_name, sync_keys_table(table_name)):
+                # Keys of the committed chunks were never recorded; start over
+                rows_done = 0
+
             # Create table if it doesn't exist
-            columns = []
-            for col in df.columns:
-                dtype = "VARCHAR(255)"  # Default type
-                columns.append(f"{col} {dtype}")
-            columns_str = ", ".join(columns)
-            cursor.execute(f"CREATE TABLE IF NOT EXISTS {table_name} ({columns_str})")
-            
-            # Insert data
-            for _, row in df.iterrows():
-                values = tuple(str(value) for value in row)
-                placeholders = ", ".join(["%s"] * len(values))
-                query = f"INSERT INTO {table_name} ({', '.join(df.columns)}) VALUES ({placeholders})"
-                cursor.execute(query, values)
-                
-            self.connection.commit()
-            return True, f"CSV data imported successfully into '{table_name}'!"
+            if table_exists:
+                schema = []
+            elif infer_types:
+                schema = infer_csv_schema(csv_path, sample_rows=sample_rows)
+            else:
+                schema = [(col, "VARCHAR(255)") for col in header]
+            types = dict(schema)
+            if not table_exists:
+                if sync_key:
+                    schema = [(col, dtype) for col, dtype in schema if col != ROW_HASH_COLUMN]
+                    schema.append((ROW_HASH_COLUMN, "CHAR(40)"))
+                    if not primary_key and not auto_id:
+                        primary_key = sync_key
+                definitions = self._table_definitions(schema, primary_key, auto_id)
+                self._execute(cursor, f"CREATE TABLE {table} ({', '.join(definitions)})")
+
+            placeholders = ", ".join(["%s"] * len(columns))
+            query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+            if sync_key:
+                self._prepare_sync(cursor, db_name, table_name, sync_key, delete_missing,
+                                   fresh=not rows_done)
+                key_index = [header.index(col) for col in sync_key]
+                hash_column = quote_identifier(ROW_HASH_COLUMN)
+                updates = ", ".join(f"{col} = VALUES({col})"
+                                    for col, name in zip(columns, header) if name not in sync_key)
+                query = (f"INSERT INTO {table} ({', '.join(columns)}, {hash_column}) "
+                         f"VALUES ({placeholders}, %s) ON DUPLICATE KEY UPDATE "
+                         f"{updates + ', ' if updates else ''}"
+                         f"{hash_column} = VALUES({hash_column})")
+
+            # The data rows committed by a previous run are dropped after
+            # parsing: skiprows counts file lines, which blank lines and quoted
+            # newlines make differ from rows
+            reader = skip_parsed_rows(
+                pd.read_csv(csv_path, chunksize=chunk_size, usecols=header if sync_key else None),
+                rows_done
+            )
+            # Row hashes come from the same rows read back as untouched text
+            raw_reader = None
+            if sync_key:
+                raw_reader = skip_parsed_rows(
+                    pd.read_csv(csv_path, chunksize=chunk_size, usecols=header,
+                                dtype=str, keep_default_na=False),
+                    rows_done
+                )
+
+            # executemany() sends each chunk as a single multi-row INSERT
+            imported = 0
+            inserted = updated = 0
+            rate = 0.0
+            started = time.perf_counter()
+            for chunk in reader:
+                if cancel_event is not None and cancel_event.is_set():
+                    return False, (f"Import cancelled after {rows_done:,} rows; "
+                                   "import again to resume")
+                raw = next(raw_reader) if sync_key else None
+                if chunk.empty:
+                    continue
+                rows = [
+                    tuple(to_db_value(value) for value in row)
+                    for row in chunk.itertuples(index=False, name=None)
+                ]
+                if sync_key:
+                    hashes = [row_hash(row) for row in raw.itertuples(index=False, name=None)]
+                    changed, new = self._changed_sync_rows(cursor, table_name, sync_key,
+                                                           key_index, rows, hashes)
+                    if changed:
+                        self._execute(cursor, query, changed, many=True)
+                    inserted += new
+                    updated += len(changed) - new
+                    if delete_missing:
+                        self._record_sync_keys(cursor, table_name, sync_key, key_index, rows)
+                else:
+                    self._execute(cursor, query, rows, many=True)
+                rows_done += len(rows)
+                imported += len(rows)
+                self._set_import_progress(cursor, table_name, source_key, csv_path, rows_done)
+                connection.commit()
+
+                rate = imported / max(time.perf_counter() - started, 1e-9)
+                if progress_callback:
+                    progress_callback(rows_done, rate)
+
+            deleted = 0
+            if sync_key and delete_missing:
+                deleted = self._delete_unsynced_rows(cursor, table_name, sync_key)
+            self._clear_import_progress(cursor, table_name, source_key)
+            connection.commit()
+            if sync_key:
+                self._execute(cursor, f"DROP TEMPORARY TABLE IF EXISTS "
+                                      f"{quote_identifier(SYNC_CHUNK_TABLE)}")
+            if sync_key and delete_missing:
+                self._execute(cursor, f"DROP TABLE {quote_identifier(sync_keys_table(table_name))}")
+
+            # Secondary indexes are cheaper to build once after the bulk load
+            self._create_indexes(cursor, table_name, indexes, types)
+            if sync_key:
+                return True, (f"'{table_name}' synced: {inserted:,} inserted, {updated:,} updated, "
+                              f"{imported - inserted - updated:,} unchanged, {deleted:,} deleted "
+                              f"({rate:.0f} rows/sec)")
+            return True, (f"CSV data imported successfully into '{table_name}'! "
+                          f"({imported} rows, {rate:.0f} rows/sec)")
+        except Error as e:
+            if self.pool:
+                self._checkout().rollback()
+            return False, f"Error: {e} (import again to resume from the last committed chunk)"
+        except (OSError, ValueError) as e:
+            return False, f"Error: {e}"
+        finally:
+            self.invalidate_metadata(db_name)
+
+    def _table_exists(self, cursor, db_name, table_name):
+        # Exact match: in SHOW TABLES LIKE, "_" and "%" are wildcards
+        return self._query(
+            cursor,
+            "SELECT 1 FROM information_schema.TABLES WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s",
+            (db_name, table_name),
+            one=True
+        ) is not None
+
+    def _prepare_sync(self, cursor, db_name, table_name, sync_key, delete_missing, fresh):
+        # Upserts need the hash column and a unique key on exactly sync_key;
+        # delete_missing also needs a table of the keys seen so far, which
+        # outlives an interrupted run so a resumed one still sees every key
+        self.invalidate_metadata(db_name)
+        info = self.get_table_info(db_name, table_name)
+        table = quote_identifier(table_name)
+        key_str = ", ".join(key_part(col, info["types"].get(col, "").upper()) for col in sync_key)
+        if ROW_HASH_COLUMN not in info["types"]:
+            self._execute(cursor, f"ALTER TABLE {table} ADD COLUMN "
+                                  f"{quote_identifier(ROW_HASH_COLUMN)} CHAR(40) NULL")
+        if set(sync_key) not in [set(cols) for cols in info["unique_keys"].values()]:
+            index_name = quote_identifier(f"sync_{'_'.join(sync_key)}"[:64])
+            self._execute(cursor, f"ALTER TABLE {table} ADD UNIQUE KEY {index_name} ({key_str})")
+        # Staging tables copy the key columns' definitions (type, charset,
+        # collation) from the table itself, so their keys match it exactly
+        # as the upsert does
+        keys = ", ".join(quote_identifier(col) for col in sync_key)
+        chunk = quote_identifier(SYNC_CHUNK_TABLE)
+        self._execute(cursor, f"DROP TEMPORARY TABLE IF EXISTS {chunk}")
+        self._execute(cursor, f"CREATE TEMPORARY TABLE {chunk} (_pos INT NOT NULL PRIMARY KEY) "
+                              f"SELECT {keys}, {quote_identifier(ROW_HASH_COLUMN)} "
+                              f"FROM {table} LIMIT 0")
+        if delete_missing:
+            staging = quote_identifier(sync_keys_table(table_name))
+            if fresh:
+                self._execute(cursor, f"DROP TABLE IF EXISTS {staging}")
+            self._execute(cursor, f"CREATE TABLE IF NOT EXISTS {staging} "
+                                  f"(PRIMARY KEY ({key_str})) SELECT {keys} FROM {table} LIMIT 0")
+        self.invalidate_metadata(db_name)
+
+    def _changed_sync_rows(self, cursor, table_name, sync_key, key_index, rows, hashes):
+        # Appends each row's hash and keeps the rows that are new or whose
+        # stored hash differs. The diff runs on the server against the
+        # chunk's keys, since the CSV's parsed values and the stored ones
+        # differ in form (5.5 vs Decimal('5.50'), True vs 1, ...).
+        hashed = [row + (digest,) for row, digest in zip(rows, hashes)]
+        chunk = quote_identifier(SYNC_CHUNK_TABLE)
+        keys = [quote_identifier(col) for col in sync_key]
+        hash_column = quote_identifier(ROW_HASH_COLUMN)
+        self._execute(cursor, f"TRUNCATE TABLE {chunk}")
+        placeholders = ", ".join(["%s"] * (len(keys) + 2))
+        self._execute(
+            cursor,
+            f"INSERT INTO {chunk} (_pos, {', '.join(keys)}, {hash_column}) VALUES ({placeholders})",
+            [(pos, *(row[i] for i in key_index), row[-1]) for pos, row in enumerate(hashed)],
+            many=True
+        )
+        join = " AND ".join(f"t.{col} = s.{col}" for col in keys)
+        status = self._query(
+            cursor,
+            f"SELECT s._pos, t.{keys[0]} IS NULL, s.{hash_column} <=> t.{hash_column} "
+            f"FROM {chunk} s LEFT JOIN {quote_identifier(table_name)} t ON {join} "
+            f"ORDER BY s._pos"
+        )
+        # A key repeated within the chunk is new only the first time; both
+        # copies come from the same CSV parse so they compare as-is
+        changed = []
+        new = 0
+        seen = set()
+        for pos, missing, same in status:
+            key = tuple(hashed[pos][i] for i in key_index)
+            if missing and key not in seen:
+                new += 1
+                seen.add(key)
+                changed.append(hashed[pos])
+            elif missing or not same:
+                changed.append(hashed[pos])
+        return changed, new
+
+    def _record_sync_keys(self, cursor, table_name, sync_key, key_index, rows):
+        keys = ", ".join(quote_identifier(col) for col in sync_key)
+        placeholders = ", ".join(["%s"] * len(sync_key))
+        self._execute(
+            cursor,
+            f"INSERT IGNORE INTO {quote_identifier(sync_keys_table(table_name))} ({keys}) "
+            f"VALUES ({placeholders})",
+            [tuple(row[i] for i in key_index) for row in rows],
+            many=True
+        )
+
+    def _delete_unsynced_rows(self, cursor, table_name, sync_key):
+        # Anti-join against the keys seen in the file
+        join = " AND ".join(f"t.{quote_identifier(col)} = s.{quote_identifier(col)}"
+                            for col in sync_key)
+        self._execute(
+            cursor,
+            f"DELETE t FROM {quote_identifier(table_name)} t "
+            f"LEFT JOIN {quote_identifier(sync_keys_table(table_name))} s ON {join} "
+            f"WHERE s.{quote_identifier(sync_key[0])} IS NULL"
+        )
+        return max(cursor.rowcount, 0)
+
+    def _table_definitions(self, schema, primary_key=(), auto_id=False):
+        types = dict(schema)
+        definitions = [f"{quote_identifier(col)} {dtype}" for col, dtype in schema]
+        if auto_id:
+            definitions.insert(0, "id BIGINT AUTO_INCREMENT PRIMARY KEY")
+        elif primary_key:
+            key_str = ", ".join(key_part(col, types.get(col, "")) for col in primary_key)
+            definitions.append(f"PRIMARY KEY ({key_str})")
+        return definitions
+
+    def import_csv_batch(self, db_name, csv_paths, table_for, max_workers=None,
+                         chunk_size=10000, progress_callback=None, resume=True,
+                         infer_types=True, sample_rows=None, primary_key=(), auto_id=False,
+                         indexes=(), cancel_event=None):
+        # Shards are parsed and inserted by worker processes, each over its own
+        # connection. A failing file is reported without stopping the others.
+        errors = {}
+        targets = {}
+        for path in csv_paths:
+            try:
+                targets[path] = table_for(path)
+            except ValueError as e:
+                errors[path] = str(e)
+        if not targets:
+            return False, self._batch_report("No CSV files to import", errors)
+        max_workers = max_workers or min(os.cpu_count() or 1, len(targets))
+        # spawn, not fork: the parent runs Tk and a thread pool
+        context = multiprocessing.get_context("spawn")
+        rows_by_path = {}
+        imported_files = set()
+        started = time.perf_counter()
+        try:
+            with context.Manager() as manager, \
+                    ProcessPoolExecutor(max_workers, mp_context=context) as executor:
+                shared_cancel = manager.Event()
+                progress_queue = manager.Queue()
+
+                # Phase 1: create missing tables from the merged stats of all
+                # their shards, so every shard's values fit the inferred types.
+                # The cached table list may predate a drop made elsewhere.
+                self.invalidate_metadata(db_name)
+                existing = set(self.get_tables(db_name))
+                new_tables = {}
+                for path, table in targets.items():
+                    if table not in existing:
+                        new_tables.setdefault(table, []).append(path)
+                table_stats = {}
+                if infer_types and new_tables:
+                    futures = {executor.submit(scan_csv_stats, path, sample_rows): path
+                               for paths in new_tables.values() for path in paths}
+                    for path, stats in self._gather(futures, errors, cancel_event, shared_cancel):
+                        merged = table_stats.setdefault(targets[path], {})
+                        for col, col_stats in stats.items():
+                            merged[col] = merge_column_stats(merged.get(col, new_column_stats()),
+                                                             col_stats)
+                cursor = self._checkout(db_name).cursor()
+                for table, paths in new_tables.items():
+                    paths = [path for path in paths if path not in errors]
+                    if not paths or shared_cancel.is_set():
+                        continue
+                    try:
+                        if infer_types:
+                            schema = [(col, mysql_type_for(col_stats))
+                                      for col, col_stats in table_stats[table].items()]
+                        else:
+                            header = pd.read_csv(paths[0], nrows=0).columns
+                            schema = [(col, "VARCHAR(255)") for col in header]
+                        definitions = self._table_definitions(schema, primary_key, auto_id)
+                        self._execute(cursor, f"CREATE TABLE {quote_identifier(table)} "
+                                              f"({', '.join(definitions)})")
+                    except (Error, OSError, ValueError, ArithmeticError) as e:
+                        for path in paths:
+                            errors[path] = f"Could not create table '{table}': {e}"
+                self.invalidate_metadata(db_name)
+
+                # Phase 2: biggest files first so the pool drains evenly
+                options = {"chunk_size": chunk_size, "resume": resume, "infer_types": False}
+                shards = sorted((path for path in targets if path not in errors),
+                                key=os.path.getsize, reverse=True)
+                futures = {
+                    executor.submit(import_csv_shard, self.config, db_name, targets[path],
+                                    path, options, shared_cancel, progress_queue): path
+                    for path in shards if not shared_cancel.is_set()
+                }
+
+                def drain_progress():
+                    while True:
+                        try:
+                            path, rows_done = progress_queue.get_nowait()
+                        except queue.Empty:
+                            break
+                        rows_by_path[path] = rows_done
+                    if progress_callback:
+                        total_rows = sum(rows_by_path.values())
+                        rate = total_rows / max(time.perf_counter() - started, 1e-9)
+                        progress_callback(len(imported_files), len(futures), total_rows, rate)
+
+                for path, (success, message) in self._gather(futures, errors, cancel_event,
+                                                              shared_cancel, drain_progress):
+                    if success:
+                        imported_files.add(path)
+                    else:
+                        errors[path] = message
+                drain_progress()
+        except (OSError, RuntimeError) as e:
+            # The process pool itself failed (e.g. a worker was killed)
+            return False, self._batch_report(f"Error: {e}", errors)
+
+        # Phase 3: secondary indexes once per table, after all of its shards
+        loaded_tables = sorted({targets[path] for path in imported_files})
+        if indexes and loaded_tables:
+            self.invalidate_metadata(db_name)
+            cursor = self._checkout(db_name).cursor()
+            for table in loaded_tables:
+                info = self.get_table_info(db_name, table) or {"types": {}}
+                types = {col: dtype.upper() for col, dtype in info["types"].items()}
+                try:
+                    self._create_indexes(cursor, table, indexes, types)
+                except Error as e:
+                    errors[table] = f"Could not create indexes: {e}"
+        self.invalidate_metadata(db_name)
+
+        total_rows = sum(rows_by_path.get(path, 0) for path in imported_files)
+        rate = total_rows / max(time.perf_counter() - started, 1e-9)
+        summary = (f"Imported {total_rows:,} rows from {len(imported_files)} of {len(csv_paths)} "
+                   f"file(s) into {len(loaded_tables)} table(s) ({rate:,.0f} rows/sec, "
+                   f"{max_workers} workers)")
+        if cancel_event is not None and cancel_event.is_set():
+            summary += "; cancelled, import again to resume"
+        return not errors, self._batch_report(summary, errors)
+
+    def _gather(self, futures, errors, cancel_event, shared_cancel, poll=None):
+        # Yields (path, result) as workers finish; failures land in errors
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            if cancel_event is not None and cancel_event.is_set() and not shared_cancel.is_set():
+                shared_cancel.set()
+                for future in pending:
+                    future.cancel()
+            if poll:
+                poll()
+            for future in done:
+                path = futures[future]
+                if future.cancelled():
+                    errors[path] = "Cancelled"
+                    continue
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # Anything raised for one shard, e.g. by pandas parsing it,
+                    # is that file's failure and must not end the batch
+                    errors[path] = f"{type(e).__name__}: {e}"
+                    continue
+                yield path, result
+
+    def _batch_report(self, summary, errors):
+        if not errors:
+            return summary
+        lines = [f"{os.path.basename(path)}: {message}"
+                 for path, message in list(errors.items())[:MAX_REPORTED_ERRORS]]
+        if len(errors) > MAX_REPORTED_ERRORS:
+            lines.append(f"... and {len(errors) - MAX_REPORTED_ERRORS} more")
+        return f"{summary}\n\n{len(errors)} failed:\n" + "\n".join(lines)
+
+    def _create_indexes(self, cursor, table_name, columns, types):
+        if not columns:
+            return
+        rows = self._query(cursor, f"SHOW INDEX FROM {quote_identifier(table_name)}")
+        indexed = {row[4] for row in rows if row[3] == 1}
+        for col in columns:
+            if col in indexed:
+                continue
+            index_name = quote_identifier(f"idx_{col}"[:64])
+            self._execute(
+                cursor,
+                f"CREATE INDEX {index_name} ON {quote_identifier(table_name)} "
+                f"({key_part(col, types.get(col, ''))})"
+            )
+
+    def _ensure_import_progress_table(self, cursor):
+        self._execute(
+            cursor,
+            f"CREATE TABLE IF NOT EXISTS {IMPORT_PROGRESS_TABLE} ("
+            "table_name VARCHAR(64) NOT NULL, "
+            "source_key CHAR(40) NOT NULL, "
+            "source_path TEXT, "
+            "rows_committed BIGINT NOT NULL DEFAULT 0, "
+            "updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP, "
+            "PRIMARY KEY (table_name, source_key))"
+        )
+
+    def _import_source_key(self, csv_path):
+        stat = os.stat(csv_path)
+        signature = f"{os.path.abspath(csv_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+        return hashlib.sha1(signature.encode("utf-8")).hexdigest()
+
+    def _get_import_progress(self, cursor, table_name, source_key):
+        row = self._query(
+            cursor,
+            f"SELECT rows_committed FROM {IMPORT_PROGRESS_TABLE} "
+            "WHERE table_name = %s AND source_key = %s",
+            (table_name, source_key),
+            one=True
+        )
+        return row[0] if row else 0
+
+    def _set_import_progress(self, cursor, table_name, source_key, csv_path, rows_done):
+        self._execute(
+            cursor,
+            f"INSERT INTO {IMPORT_PROGRESS_TABLE} "
+            "(table_name, source_key, source_path, rows_committed) VALUES (%s, %s, %s, %s) "
+            "ON DUPLICATE KEY UPDATE rows_committed = VALUES(rows_committed)",
+            (table_name, source_key, os.path.abspath(csv_path), rows_done)
+        )
+
+    def _clear_import_progress(self, cursor, table_name, source_key):
+        self._execute(
+            cursor,
+            f"DELETE FROM {IMPORT_PROGRESS_TABLE} WHERE table_name = %s AND source_key = %s",
+            (table_name, source_key)
+        )
+
+    def export_table(self, db_name, table_name, output_path, batch_size=EXPORT_BATCH_SIZE,
+                     progress_callback=None, cancel_event=None):
+        connection = None
+        try:
+            fmt = export_format(output_path)
+            connection = self._checkout(db_name)
+            # Unbuffered: the server streams rows and only one batch is held
+            cursor = connection.cursor(buffered=False)
+            query = f"SELECT * FROM {quote_identifier(table_name)}"
+            started = time.perf_counter()
+            cursor.execute(query)
+            columns = [desc[0] for desc in cursor.description]
+            if fmt == "parquet":
+                writer = ParquetExportWriter(output_path, cursor.description)
+            else:
+                writer = CsvExportWriter(output_path, columns, compress=fmt == "csv.gz")
+            
+            exported = 0
+            rate = 0.0
+            row_bytes = 0
+            try:
+                while True:
+                    if cancel_event is not None and cancel_event.is_set():
+                        return False, f"Export cancelled after {exported:,} rows"
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    if not row_bytes:
+                        # Size the first batch only; scanning every cell would slow the stream
+                        row_bytes = estimate_bytes(rows) / len(rows)
+                    writer.write(rows)
+                    exported += len(rows)
+                    rate = exported / max(time.perf_counter() - started, 1e-9)
+                    if progress_callback:
+                        progress_callback(exported, rate)
+            finally:
+                writer.close()
+                # One sample for the whole streamed transfer
+                self.stats.record_query(query, time.perf_counter() - started, rows=exported,
+                                        nbytes=int(row_bytes * exported))
+            return True, (f"Exported {exported:,} rows from '{table_name}' to {output_path} "
+                          f"({rate:,.0f} rows/sec)")
         except Error as e:
             return False, f"Error: {e}"
+        except (OSError, ImportError, ValueError) as e:
+            return False, f"Error: {e}"
+        finally:
+            if connection is not None and connection.unread_result:
+                # Abandoned stream; reconnecting is cheaper than draining it
+                connection.reconnect(attempts=3, delay=1)
+                self._local.database = None
+
+    def row_key(self, db_name, table_name):
+        # Primary key, else the first unique key without nullable columns
+        info = self.get_table_info(db_name, table_name)
+        if not info:
+            return []
+        if info["primary_key"]:
+            return info["primary_key"]
+        for name in sorted(info["unique_keys"]):
+            columns = info["unique_keys"][name]
+            if not set(columns) & info["nullable"]:
+                return columns
+        return []
+
+    def _key_in_clauses(self, key_columns, rows):
+        # Yields "key IN (...)" clauses with their params, in bounded batches
+        keys = ", ".join(quote_identifier(col) for col in key_columns)
+        if len(key_columns) > 1:
+            keys = f"({keys})"
+            placeholder = f"({', '.join(['%s'] * len(key_columns))})"
+        else:
+            placeholder = "%s"
+        for start in range(0, len(rows), KEY_BATCH_SIZE):
+            batch = rows[start:start + KEY_BATCH_SIZE]
+            params = [row[col] for row in batch for col in key_columns]
+            yield f"{keys} IN ({', '.join([placeholder] * len(batch))})", params
 
-    def update_row(self, db_name, table_name, column_values, where_clause):
+    def _match_row_clause(self, row):
+        # Last resort for keyless tables: NULL-safe match on every column
+        return " AND ".join(f"{quote_identifier(col)} <=> %s" for col in row)
+
+    def update_row(self, db_name, table_name, column_values, row):
+        return self.update_rows(db_name, table_name, column_values, [row])
+
+    def update_rows(self, db_name, table_name, column_values, rows):
+        # rows are {column: original value} dicts; the same new values are
+        # applied to all of them in a single transaction
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(f"USE {db_name}")
+            connection = self._checkout(db_name)
+            cursor = connection.cursor()
             
-            set_clause = ", ".join([f"{col} = %s" for col in column_values.keys()])
-            query = f"UPDATE {table_name} SET {set_clause} WHERE {where_clause}"
+            set_clause = ", ".join([f"{quote_identifier(col)} = %s" for col in column_values.keys()])
+            query = f"UPDATE {quote_identifier(table_name)} SET {set_clause} WHERE "
+            values = list(column_values.values())
             
-            cursor.execute(query, list(column_values.values()))
-            self.connection.commit()
-            return True, "Row updated successfully!"
+            updated = 0
+            key_columns = self.row_key(db_name, table_name)
+            if key_columns:
+                for where_clause, params in self._key_in_clauses(key_columns, rows):
+                    self._execute(cursor, query + where_clause, values + params)
+                    updated += cursor.rowcount
+            else:
+                self._execute(
+                    cursor,
+                    query + self._match_row_clause(rows[0]) + " LIMIT 1",
+                    [values + list(row.values()) for row in rows],
+                    many=True
+                )
+                updated = cursor.rowcount
+            connection.commit()
+            return True, f"{updated} row(s) updated successfully!"
         except Error as e:
+            self._checkout().rollback()
             return False, f"Error: {e}"
     
-    def delete_row(self, db_name, table_name, where_clause):
+    def delete_row(self, db_name, table_name, row):
+        return self.delete_rows(db_name, table_name, [row])
+
+    def delete_rows(self, db_name, table_name, rows):
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(f"USE {db_name}")
+            connection = self._checkout(db_name)
+            cursor = connection.cursor()
             
-            query = f"DELETE FROM {table_name} WHERE {where_clause}"
-            cursor.execute(query)
-            self.connection.commit()
-            return True, "Row deleted successfully!"
+            query = f"DELETE FROM {quote_identifier(table_name)} WHERE "
+            deleted = 0
+            key_columns = self.row_key(db_name, table_name)
+            if key_columns:
+                for where_clause, params in self._key_in_clauses(key_columns, rows):
+                    self._execute(cursor, query + where_clause, params)
+                    deleted += cursor.rowcount
+            else:
+                self._execute(
+                    cursor,
+                    query + self._match_row_clause(rows[0]) + " LIMIT 1",
+                    [list(row.values()) for row in rows],
+                    many=True
+                )
+                deleted = cursor.rowcount
+            connection.commit()
+            return True, f"{deleted} row(s) deleted successfully!"
         except Error as e:
+            self._checkout().rollback()
             return False, f"Error: {e}"
 
+def import_csv_shard(config, db_name, table_name, csv_path, options, cancel_event,
+                     progress_queue):
+    # Runs in a worker process of import_csv_batch with its own connection;
+    # resume progress is kept per shard in IMPORT_PROGRESS_TABLE
+    db_manager = DatabaseManager(pool_size=1)
+    success, message = db_manager.connect(**config)
+    if not success:
+        return success, message
+    return db_manager.import_csv(
+        db_name, table_name, csv_path, cancel_event=cancel_event,
+        progress_callback=lambda rows_done, rate: progress_queue.put((csv_path, rows_done)),
+        **options
+    )
+
+class Job:
+    _ids = itertools.count(1)
+
+    def __init__(self, runner, description, on_done=None, on_error=None, on_progress=None):
+        self.id = next(self._ids)
+        self.runner = runner
+        self.description = description
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.cancel_event = threading.Event()
+        self.connection_id = None
+        self.started = False
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def report(self, status, progress=None):
+        # Safe to call from the worker thread
+        self.runner.events.put(("progress", self, (status, progress)))
+
+    def cancel(self):
+        self.cancel_event.set()
+        if self.started and self.connection_id is not None:
+            self.runner.kill(self.connection_id)
+
+class JobRunner:
+    # Runs DatabaseManager calls off the Tk thread. Workers never touch Tk;
+    # their results are queued and dispatched from the mainloop via after().
+    POLL_MS = 50
+
+    def __init__(self, root, db_manager, max_workers=1, on_change=None):
+        self.root = root
+        self.db_manager = db_manager
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix="db-job")
+        self.events = queue.Queue()
+        self.jobs = []
+        self.on_change = on_change
+        root.after(self.POLL_MS, self._poll)
+
+    def submit(self, description, fn, on_done=None, on_error=None, on_progress=None):
+        job = Job(self, description, on_done, on_error, on_progress)
+        self.jobs.append(job)
+        self.executor.submit(self._run, job, fn)
+        self._changed(job, description, None)
+        return job
+
+    def cancel_all(self):
+        for job in list(self.jobs):
+            job.cancel()
+
+    def shutdown(self):
+        self.cancel_all()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def kill(self, connection_id):
+        threading.Thread(target=self.db_manager.kill_query, args=(connection_id,),
+                         daemon=True).start()
+
+    def _run(self, job, fn):
+        if job.cancelled:
+            self.events.put(("cancelled", job, None))
+            return
+        try:
+            # Checking out the connection can fail too (pool exhausted, lost
+            # server), so it is reported through the same error event
+            job.connection_id = self.db_manager.connection_id()
+            job.started = True
+            result = fn(job)
+        except Exception as e:
+            self.events.put(("cancelled" if job.cancelled else "error", job, e))
+        else:
+            self.events.put(("cancelled" if job.cancelled else "done", job, result))
+
+    def _poll(self):
+        # A failing callback is reported like any Tk callback error; it must
+        # not stop later events or the next poll
+        try:
+            while True:
+                try:
+                    kind, job, payload = self.events.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    self._dispatch(kind, job, payload)
+                except Exception:
+                    self.root.report_callback_exception(*sys.exc_info())
+        finally:
+            self.root.after(self.POLL_MS, self._poll)
+
+    def _dispatch(self, kind, job, payload):
+        if kind == "progress":
+            status, progress = payload
+            if job.on_progress:
+                job.on_progress(status, progress)
+            self._changed(job, status, progress)
+            return
+
+        if job in self.jobs:
+            self.jobs.remove(job)
+        try:
+            if kind == "done" and job.on_done:
+                job.on_done(payload)
+            elif kind == "cancelled":
+                # on_error(None) tells the caller the job was cancelled
+                if job.on_error:
+                    job.on_error(None)
+            elif kind == "error":
+                if job.on_error:
+                    job.on_error(payload)
+                else:
+                    messagebox.showerror("Error", f"{job.description} failed: {payload}")
+        finally:
+            # The job is finished either way, so the status bar moves on
+            self._changed(job, None, None)
+
+    def _changed(self, job, status, progress):
+        if self.on_change:
+            self.on_change(self.jobs, status, progress)
+
+class PagedTreeview:
+    # Keeps only a window of pages in a ttk.Treeview, loading the next or
+    # previous page as the user scrolls near either edge and prefetching the
+    # next page while idle. fetch(direction, boundary_row, offset, callback)
+    # supplies rows "after" or "before" the given boundary row.
+    def __init__(self, tree, scrollbar, status_label=None, page_size=200, window_pages=5):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.status_label = status_label
+        self.page_size = page_size
+        self.max_rows = page_size * window_pages
+        self.fetch = None
+        self.rows = []
+        self.start = 0
+        self.at_top = True
+        self.at_end = True
+        self.loading = False
+        self.updating = False
+        self.prefetched = None
+        self.generation = 0
+        self.total_hint = None
+        self.view = (0.0, 1.0)
+        tree.configure(yscrollcommand=self._on_scroll)
+
+    def load(self, columns, rows, fetch, total_hint=None):
+        self.generation += 1
+        self.fetch = fetch
+        self.total_hint = total_hint
+        self.tree.delete(*self.tree.get_children())
+        self.tree["columns"] = columns
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, minwidth=100, width=150)
+        self.rows = []
+        self.start = 0
+        self.at_top = True
+        self.at_end = False
+        self.loading = False
+        self.prefetched = None
+        self._append(rows)
+        self.tree.yview_moveto(0)
+
+    def clear(self):
+        self.load([], [], None)
+        self.at_end = True
+
+    def row_for_item(self, item):
+        return self.rows[int(item) - self.start]
+
+    def _request(self, direction, boundary, offset, apply):
+        self.loading = True
+        generation = self.generation
+
+        def on_rows(rows):
+            # rows is None when the fetch failed or was cancelled
+            if generation != self.generation:
+                return
+            self.loading = False
+            if rows is not None:
+                apply(rows)
+
+        self.fetch(direction, boundary, offset, on_rows)
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self.view = (float(first), float(last))
+        if not self.updating:
+            self._maybe_load()
+
+    def _maybe_load(self):
+        if self.loading or self.fetch is None or not self.rows:
+            return
+        first, last = self.view
+        end = self.start + len(self.rows)
+        if last >= 0.9 and not self.at_end:
+            if self.prefetched and self.prefetched[0] == end:
+                rows = self.prefetched[1]
+                self.prefetched = None
+                self._append(rows)
+            else:
+                self._request("after", self.rows[-1], end, self._append)
+        elif first <= 0.1 and not self.at_top:
+            self._request("before", self.rows[0], self.start, self._prepend)
+
+    def _prefetch(self):
+        if self.at_end or self.loading or self.prefetched or self.fetch is None or not self.rows:
+            return
+        end = self.start + len(self.rows)
+
+        def store(rows):
+            self.prefetched = (end, rows)
+            self._maybe_load()
+
+        self._request("after", self.rows[-1], end, store)
+
+    def _append(self, rows):
+        self.updating = True
+        anchor = self.tree.identify_row(1)
+        end = self.start + len(self.rows)
+        for i, row in enumerate(rows):
+            self.tree.insert("", "end", iid=str(end + i), values=row)
+        self.rows.extend(rows)
+        self.at_end = len(rows) < self.page_size
+
+        overflow = len(self.rows) - self.max_rows
+        if overflow > 0:
+            self.tree.delete(*[str(self.start + i) for i in range(overflow)])
+            del self.rows[:overflow]
+            self.start += overflow
+            self.at_top = False
+            self._restore_view(anchor)
+        self.updating = False
+        self._update_status()
+        self.tree.after_idle(self._prefetch)
+
+    def _prepend(self, rows):
+        # A short page means nothing is left above, even when start > 0
+        # because rows were deleted meanwhile; start only numbers the iids,
+        # so it must not be reset under the existing items
+        self.at_top = len(rows) < self.page_size or self.start == len(rows)
+        if not rows:
+            return
+        self.updating = True
+        anchor = self.tree.identify_row(1)
+        for i, row in enumerate(reversed(rows)):
+            self.tree.insert("", 0, iid=str(self.start - 1 - i), values=row)
+        self.start -= len(rows)
+        self.rows[:0] = rows
+
+        overflow = len(self.rows) - self.max_rows
+        if overflow > 0:
+            end = self.start + len(self.rows)
+            self.tree.delete(*[str(end - 1 - i) for i in range(overflow)])
+            del self.rows[-overflow:]
+            self.at_end = False
+            self.prefetched = None
+        self._restore_view(anchor)
+        self.updating = False
+        self._update_status()
+
+    def _restore_view(self, anchor):
+        # Keep the row the user was looking at in place after trimming
+        if anchor and self.tree.exists(anchor):
+            self.tree.yview_moveto(self.tree.index(anchor) / max(len(self.rows), 1))
+
+    def _update_status(self):
+        if self.status_label is None:
+            return
+        if not self.rows:
+            self.status_label.configure(text="No rows")
+            return
+        suffix = "" if self.at_end else "+"
+        if self.total_hint and not self.at_end:
+            suffix = f" of ~{self.total_hint:,}"
+        self.status_label.configure(
+            text=f"Rows {self.start + 1:,}–{self.start + len(self.rows):,}{suffix}"
+        )
+
 class App(ctk.CTk):
     def __init__(self):
         super().__init__()
@@ -117,6 +1718,12 @@ class App(ctk.CTk):
         self.geometry("1000x700")
         
         self.db_manager = DatabaseManager()
+        # One worker per pooled connection so imports and browsing overlap
+        self.jobs = JobRunner(self, self.db_manager, max_workers=self.db_manager.pool_size,
+                              on_change=self.update_job_status)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        self.setup_status_bar()
         
         # Create tabs
         self.tabview = ctk.CTkTabview(self)
@@ -125,12 +1732,55 @@ class App(ctk.CTk):
         self.tab_connect = self.tabview.add("Connect")
         self.tab_manage = self.tabview.add("Manage")
         self.tab_explorer = self.tabview.add("Explorer")
+        self.tab_console = self.tabview.add("SQL Console")
         self.tab_import = self.tabview.add("Import CSV")
+        self.tab_stats = self.tabview.add("Query Stats")
         
         self.setup_connect_tab()
         self.setup_manage_tab()
         self.setup_explorer_tab()
+        self.setup_console_tab()
         self.setup_import_tab()
+        self.setup_stats_tab()
+        
+    def setup_status_bar(self):
+        frame = ctk.CTkFrame(self)
+        frame.pack(side="bottom", padx=10, pady=(0, 10), fill="x")
+        
+        self.status_label = ctk.CTkLabel(frame, text="Ready", anchor="w")
+        self.status_label.pack(side="left", padx=5, fill="x", expand=True)
+        
+        self.cancel_button = ctk.CTkButton(frame, text="Cancel", width=80, 
+                                          state="disabled", command=self.jobs.cancel_all)
+        self.cancel_button.pack(side="right", padx=5)
+        
+        self.progress_bar = ctk.CTkProgressBar(frame, mode="indeterminate", width=200)
+        self.progress_bar.pack(side="right", padx=5)
+        self.progress_bar.set(0)
+        
+    def update_job_status(self, jobs, status, progress):
+        if not jobs:
+            self.progress_bar.stop()
+            self.progress_bar.configure(mode="indeterminate")
+            self.progress_bar.set(0)
+            self.cancel_button.configure(state="disabled")
+            self.status_label.configure(text="Ready")
+            return
+        
+        queued = f" (+{len(jobs) - 1} queued)" if len(jobs) > 1 else ""
+        self.status_label.configure(text=f"{status or jobs[0].description}{queued}")
+        self.cancel_button.configure(state="normal")
+        if progress is None:
+            self.progress_bar.configure(mode="indeterminate")
+            self.progress_bar.start()
+        else:
+            self.progress_bar.stop()
+            self.progress_bar.configure(mode="determinate")
+            self.progress_bar.set(progress)
+            
+    def on_close(self):
+        self.jobs.shutdown()
+        self.destroy()
         
     def setup_connect_tab(self):
         # Connection frame
@@ -192,8 +1842,31 @@ class App(ctk.CTk):
         
         # Refresh button
         ctk.CTkButton(controls_frame, text="🔄 Refresh", 
-                     command=lambda: self.on_database_select(self.db_listbox.get())
-                     ).pack(side="right", padx=5)
+                     command=self.refresh_tables).pack(side="right", padx=5)
+        ctk.CTkButton(controls_frame, text="Columns...", 
+                     command=self.choose_table_columns).pack(side="right", padx=5)
+        
+        # Filters are ANDed and run on the server; click a heading to sort
+        filter_frame = ctk.CTkFrame(main_frame)
+        filter_frame.pack(padx=10, pady=5, fill="x")
+        
+        ctk.CTkLabel(filter_frame, text="Filter:").pack(side="left", padx=5)
+        self.filter_column_menu = ctk.CTkOptionMenu(filter_frame, values=[])
+        self.filter_column_menu.pack(side="left", padx=5)
+        self.filter_column_menu.set("")
+        self.filter_operator_menu = ctk.CTkOptionMenu(filter_frame, values=list(FILTER_OPERATORS),
+                                                     width=110)
+        self.filter_operator_menu.pack(side="left", padx=5)
+        self.filter_value_entry = ctk.CTkEntry(filter_frame, placeholder_text="value")
+        self.filter_value_entry.pack(side="left", padx=5)
+        ctk.CTkButton(filter_frame, text="Add Filter", width=90, 
+                     command=self.add_table_filter).pack(side="left", padx=5)
+        ctk.CTkButton(filter_frame, text="Clear", width=60, 
+                     command=self.clear_table_filters).pack(side="left", padx=5)
+        self.filter_label = ctk.CTkLabel(filter_frame, text="", anchor="w")
+        self.filter_label.pack(side="left", padx=5, fill="x", expand=True)
+        
+        self.table_view = {"filters": [], "sort": None, "columns": None}
         
         # Create main content frame
         content_frame = ctk.CTkFrame(main_frame)
@@ -203,7 +1876,7 @@ class App(ctk.CTk):
         style = ttk.Style()
         style.configure("Treeview", rowheight=25)
         
-        self.tree = ttk.Treeview(content_frame)
+        self.tree = ttk.Treeview(content_frame, selectmode="extended")
         self.tree.pack(pady=10, fill="both", expand=True)
         
         # Scrollbars
@@ -212,7 +1885,7 @@ class App(ctk.CTk):
         hsb = ttk.Scrollbar(content_frame, orient="horizontal", command=self.tree.xview)
         hsb.pack(side='bottom', fill='x')
         
-        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        self.tree.configure(xscrollcommand=hsb.set)
         
         # Edit/Delete buttons frame
         buttons_frame = ctk.CTkFrame(main_frame)
@@ -222,13 +1895,215 @@ class App(ctk.CTk):
                      command=self.edit_selected_row).pack(side="left", padx=5)
         ctk.CTkButton(buttons_frame, text="Delete Selected", 
                      command=self.delete_selected_row).pack(side="left", padx=5)
+        ctk.CTkButton(buttons_frame, text="Export...", 
+                     command=self.export_table_data).pack(side="left", padx=5)
+        
+        self.page_label = ctk.CTkLabel(buttons_frame, text="")
+        self.page_label.pack(side="right", padx=5)
+        
+        self.pager = PagedTreeview(self.tree, vsb, self.page_label)
+        
+    def setup_console_tab(self):
+        main_frame = ctk.CTkFrame(self.tab_console)
+        main_frame.pack(padx=10, pady=10, fill="both", expand=True)
+        
+        controls_frame = ctk.CTkFrame(main_frame)
+        controls_frame.pack(padx=10, pady=5, fill="x")
+        ctk.CTkLabel(controls_frame, text="Database:").pack(side="left", padx=5)
+        self.console_db_menu = ctk.CTkOptionMenu(controls_frame, values=[])
+        self.console_db_menu.pack(side="left", padx=5)
+        ctk.CTkLabel(controls_frame, text="Max rows:").pack(side="left", padx=5)
+        self.console_max_rows_entry = ctk.CTkEntry(controls_frame, width=80)
+        self.console_max_rows_entry.pack(side="left", padx=5)
+        self.console_max_rows_entry.insert(0, str(QUERY_MAX_ROWS))
+        ctk.CTkLabel(controls_frame, text="History:").pack(side="left", padx=5)
+        self.console_history_menu = ctk.CTkOptionMenu(controls_frame, values=[], width=300,
+                                                      command=self.replay_console_query)
+        self.console_history_menu.pack(side="left", padx=5, fill="x", expand=True)
+        self.console_history_menu.set("")
+        
+        self.console_sql_text = ctk.CTkTextbox(main_frame, height=120)
+        self.console_sql_text.pack(padx=10, pady=5, fill="x")
+        
+        params_frame = ctk.CTkFrame(main_frame)
+        params_frame.pack(padx=10, pady=5, fill="x")
+        ctk.CTkLabel(params_frame, 
+                    text='Parameters for %s placeholders (JSON list, e.g. ["Europe", 10]):').pack(side="left", padx=5)
+        self.console_params_entry = ctk.CTkEntry(params_frame)
+        self.console_params_entry.pack(side="left", padx=5, fill="x", expand=True)
+        
+        buttons_frame = ctk.CTkFrame(main_frame)
+        buttons_frame.pack(padx=10, pady=5, fill="x")
+        ctk.CTkButton(buttons_frame, text="▶ Run", 
+                     command=self.run_console_query).pack(side="left", padx=5)
+        ctk.CTkButton(buttons_frame, text="Explain", 
+                     command=lambda: self.explain_console_query(False)).pack(side="left", padx=5)
+        ctk.CTkButton(buttons_frame, text="Explain Analyze", 
+                     command=lambda: self.explain_console_query(True)).pack(side="left", padx=5)
+        self.console_status_label = ctk.CTkLabel(buttons_frame, text="")
+        self.console_status_label.pack(side="left", padx=10)
+        self.console_page_label = ctk.CTkLabel(buttons_frame, text="")
+        self.console_page_label.pack(side="right", padx=5)
+        
+        content_frame = ctk.CTkFrame(main_frame)
+        content_frame.pack(padx=10, pady=5, fill="both", expand=True)
+        self.console_tree = ttk.Treeview(content_frame, show="headings")
+        self.console_tree.pack(pady=10, fill="both", expand=True)
+        vsb = ttk.Scrollbar(content_frame, orient="vertical", command=self.console_tree.yview)
+        vsb.pack(side='right', fill='y')
+        hsb = ttk.Scrollbar(content_frame, orient="horizontal", command=self.console_tree.xview)
+        hsb.pack(side='bottom', fill='x')
+        self.console_tree.configure(xscrollcommand=hsb.set)
+        self.console_pager = PagedTreeview(self.console_tree, vsb, self.console_page_label)
+        
+        self.console_plan_text = ctk.CTkTextbox(main_frame, height=120)
+        self.console_plan_text.pack(padx=10, pady=5, fill="x")
+        
+        self.query_history = QueryHistory()
+        self.console_history_keys = {}
+        
+    def console_request(self):
+        # (database, sql, params) from the console inputs, or None after
+        # telling the user what is wrong
+        sql = self.console_sql_text.get("1.0", "end").strip()
+        if not sql:
+            messagebox.showwarning("Warning", "Please enter a query")
+            return None
+        text = self.console_params_entry.get().strip()
+        params = None
+        if text:
+            try:
+                params = json.loads(text)
+            except ValueError as e:
+                messagebox.showerror("Error", f"Parameters must be a JSON list: {e}")
+                return None
+            if not isinstance(params, list):
+                messagebox.showerror("Error", "Parameters must be a JSON list")
+                return None
+        return self.console_db_menu.get() or None, sql, params
+        
+    def run_console_query(self):
+        request = self.console_request()
+        if request is None:
+            return
+        db_name, sql, params = request
+        try:
+            max_rows = max(int(self.console_max_rows_entry.get()), 1)
+        except ValueError:
+            messagebox.showerror("Error", "Max rows must be a whole number!")
+            return
+            
+        def run(job):
+            return self.db_manager.run_query(
+                db_name, sql, params, max_rows=max_rows, cancel_event=job.cancel_event,
+                progress_callback=lambda rows_done: job.report(f"Fetched {rows_done:,} rows")
+            )
+            
+        def on_done(result):
+            if result["columns"]:
+                self.query_history.put(QueryHistory.key(db_name, sql, params),
+                                       dict(result, db_name=db_name, sql=sql, params=params,
+                                            ran_at=time.time()))
+                self.refresh_console_history()
+            self.show_console_result(result)
+            
+        self.console_status_label.configure(text="Running...")
+        self.jobs.submit(
+            "Running query", run, on_done=on_done,
+            on_error=lambda error: self.console_status_label.configure(
+                text="Cancelled" if error is None else f"Error: {error}")
+        )
+        
+    def explain_console_query(self, analyze):
+        request = self.console_request()
+        if request is None:
+            return
+        db_name, sql, params = request
+        
+        def on_done(result):
+            lines = []
+            for row in result["rows"]:
+                if len(result["columns"]) == 1:
+                    lines.append(str(row[0]))
+                else:
+                    lines.append(", ".join(f"{col}={value}" 
+                                           for col, value in zip(result["columns"], row)
+                                           if value is not None))
+            label = "EXPLAIN ANALYZE" if analyze else "EXPLAIN"
+            self.console_plan_text.delete("1.0", "end")
+            self.console_plan_text.insert(
+                "end", f"{label} ({result['seconds'] * 1000:.1f} ms)\n" + "\n".join(lines))
+            
+        def on_error(error):
+            if error is not None:
+                messagebox.showerror("Explain", f"Error: {error}")
+                
+        self.jobs.submit(
+            "Explaining query",
+            lambda job: self.db_manager.explain_query(db_name, sql, params, analyze=analyze),
+            on_done=on_done, on_error=on_error
+        )
+        
+    def show_console_result(self, result, cached=False):
+        if not result["columns"]:
+            self.console_pager.clear()
+            self.console_status_label.configure(
+                text=f"{result['rowcount']:,} row(s) affected in {result['seconds'] * 1000:.1f} ms")
+            return
+        rows = result["rows"]
+        page_size = self.console_pager.page_size
+        self.console_pager.load(result["columns"], rows[:page_size], 
+                                self._memory_page_fetcher(rows, page_size),
+                                total_hint=len(rows))
+        status = f"{len(rows):,} rows in {result['seconds'] * 1000:.1f} ms"
+        if result["truncated"]:
+            status += " (truncated at the row cap)"
+        if cached:
+            status += ", replayed from history"
+        self.console_status_label.configure(text=status)
+        
+    def _memory_page_fetcher(self, rows, page_size):
+        # The whole capped result is already in memory; serve pages from it
+        def fetch(direction, boundary, offset, callback):
+            if direction == "before":
+                callback(rows[max(offset - page_size, 0):offset])
+            else:
+                callback(rows[offset:offset + page_size])
+                
+        return fetch
+        
+    def refresh_console_history(self):
+        self.console_history_keys = {}
+        for key, result in self.query_history.recent():
+            when = time.strftime("%H:%M:%S", time.localtime(result["ran_at"]))
+            sql = " ".join(result["sql"].split())
+            label = f"{when}  {sql[:60]}{'…' if len(sql) > 60 else ''}"
+            # Identical labels would hide an entry from the menu
+            while label in self.console_history_keys:
+                label += " "
+            self.console_history_keys[label] = key
+        self.console_history_menu.configure(values=list(self.console_history_keys))
+        
+    def replay_console_query(self, label):
+        result = self.query_history.get(self.console_history_keys.get(label))
+        if result is None:
+            return
+        self.console_db_menu.set(result["db_name"] or "")
+        self.console_sql_text.delete("1.0", "end")
+        self.console_sql_text.insert("1.0", result["sql"])
+        self.console_params_entry.delete(0, "end")
+        if result["params"] is not None:
+            self.console_params_entry.insert(0, json.dumps(result["params"], default=str))
+        self.show_console_result(result, cached=True)
         
     def setup_import_tab(self):
-        frame = ctk.CTkFrame(self.tab_import)
-        frame.pack(padx=10, pady=10, fill="both")
+        frame = ctk.CTkScrollableFrame(self.tab_import)
+        frame.pack(padx=10, pady=10, fill="both", expand=True)
         
         ctk.CTkButton(frame, text="Select CSV File", 
-                     command=self.select_csv).pack(pady=10)
+                     command=self.select_csv).pack(pady=(10, 5))
+        ctk.CTkButton(frame, text="Select CSV Folder", 
+                     command=self.select_csv_folder).pack(pady=5)
         
         self.csv_label = ctk.CTkLabel(frame, text="No file selected")
         self.csv_label.pack(pady=5)
@@ -241,153 +2116,439 @@ class App(ctk.CTk):
         self.import_table_entry = ctk.CTkEntry(frame)
         self.import_table_entry.pack(pady=5)
         
+        # Folder imports only: how each file picks its table, and pool size.
+        # "Single table" uses the table name above, "Regex" treats it as a
+        # pattern whose "table" group (or first group) names the table.
+        ctk.CTkLabel(frame, text="Folder import, table per file:").pack(pady=5)
+        self.import_mapping_menu = ctk.CTkOptionMenu(frame, values=list(TABLE_MAPPINGS))
+        self.import_mapping_menu.pack(pady=5)
+        
+        ctk.CTkLabel(frame, text="Folder import, parallel workers:").pack(pady=5)
+        self.import_workers_entry = ctk.CTkEntry(frame)
+        self.import_workers_entry.pack(pady=5)
+        self.import_workers_entry.insert(0, str(os.cpu_count() or 1))
+        
+        ctk.CTkLabel(frame, text="Rows per commit:").pack(pady=5)
+        self.import_chunk_entry = ctk.CTkEntry(frame)
+        self.import_chunk_entry.pack(pady=5)
+        self.import_chunk_entry.insert(0, "10000")
+        
+        self.infer_types_var = ctk.BooleanVar(value=True)
+        ctk.CTkCheckBox(frame, text="Infer column types", 
+                       variable=self.infer_types_var).pack(pady=5)
+        ctk.CTkButton(frame, text="Preview Types", 
+                     command=self.preview_csv_types).pack(pady=5)
+        
+        ctk.CTkLabel(frame, text="Primary key column(s), comma separated:").pack(pady=5)
+        self.import_pk_entry = ctk.CTkEntry(frame)
+        self.import_pk_entry.pack(pady=5)
+        
+        self.auto_id_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(frame, text="Add auto-increment id primary key", 
+                       variable=self.auto_id_var).pack(pady=5)
+        
+        ctk.CTkLabel(frame, text="Index columns, comma separated:").pack(pady=5)
+        self.import_index_entry = ctk.CTkEntry(frame)
+        self.import_index_entry.pack(pady=5)
+        
+        # Re-imports: upsert on these key columns and write only changed rows
+        ctk.CTkLabel(frame, text="Sync key column(s), comma separated (single file):").pack(pady=5)
+        self.import_sync_key_entry = ctk.CTkEntry(frame)
+        self.import_sync_key_entry.pack(pady=5)
+        
+        self.delete_missing_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(frame, text="Sync: delete rows missing from the file", 
+                       variable=self.delete_missing_var).pack(pady=5)
+        
         ctk.CTkButton(frame, text="Import CSV", 
                      command=self.import_csv_to_db).pack(pady=10)
         
+        self.import_progress_label = ctk.CTkLabel(frame, text="")
+        self.import_progress_label.pack(pady=5)
+        
+    def selected_rows(self):
+        columns = self.tree["columns"]
+        return [dict(zip(columns, self.pager.row_for_item(item)))
+                for item in self.tree.selection()]
+        
     def edit_selected_row(self):
-        selected_item = self.tree.selection()
-        if not selected_item:
+        rows = self.selected_rows()
+        if not rows:
             messagebox.showwarning("Warning", "Please select a row to edit")
             return
             
-        # Get the current values
-        current_values = self.tree.item(selected_item[0])['values']
         columns = self.tree["columns"]
+        # A single row is edited in place; for several rows only the fields
+        # that are filled in get applied to all of them
+        current_values = rows[0] if len(rows) == 1 else {}
         
         # Create edit dialog
         edit_window = ctk.CTkToplevel(self)
-        edit_window.title("Edit Row")
+        edit_window.title("Edit Row" if len(rows) == 1 else f"Edit {len(rows)} Rows")
         edit_window.geometry("400x500")
         
+        if len(rows) > 1:
+            ctk.CTkLabel(edit_window, 
+                        text="Leave a field empty to keep its current values").pack(pady=5)
+        
         # Create entries for each column
         entries = {}
-        for i, (col, val) in enumerate(zip(columns, current_values)):
+        for col in columns:
             frame = ctk.CTkFrame(edit_window)
             frame.pack(padx=10, pady=5, fill="x")
             
             ctk.CTkLabel(frame, text=f"{col}:").pack(side="left", padx=5)
             entry = ctk.CTkEntry(frame)
             entry.pack(side="left", padx=5, fill="x", expand=True)
-            entry.insert(0, str(val))
+            if current_values.get(col) is not None:
+                entry.insert(0, str(current_values[col]))
             entries[col] = entry
         
         def save_changes():
-            # Collect new values
-            new_values = {col: entry.get() for col, entry in entries.items()}
-            
-            # Create WHERE clause using all columns for unique identification
-            where_conditions = []
-            for col, old_val in zip(columns, current_values):
-                if isinstance(old_val, str):
-                    where_conditions.append(f"{col} = '{old_val}'")
-                else:
-                    where_conditions.append(f"{col} = {old_val}")
-            where_clause = " AND ".join(where_conditions)
+            # Only send the columns that actually changed
+            new_values = {}
+            for col, entry in entries.items():
+                value = entry.get()
+                if len(rows) == 1:
+                    old_val = current_values[col]
+                    if value != ("" if old_val is None else str(old_val)):
+                        new_values[col] = value
+                elif value:
+                    new_values[col] = value
+            if not new_values:
+                edit_window.destroy()
+                return
             
             # Update the database
-            success, message = self.db_manager.update_row(
-                self.db_listbox.get(),
-                self.table_listbox.get(),
-                new_values,
-                where_clause
-            )
+            db_name = self.db_listbox.get()
+            table_name = self.table_listbox.get()
             
-            if success:
-                self.show_table_data(self.table_listbox.get())
-                edit_window.destroy()
-            messagebox.showinfo("Update Row", message)
+            def on_done(result):
+                success, message = result
+                if success:
+                    self.reload_table_data()
+                    edit_window.destroy()
+                messagebox.showinfo("Update Row", message)
+                
+            self.jobs.submit(
+                f"Updating {len(rows)} row(s) in {table_name}",
+                lambda job: self.db_manager.update_rows(db_name, table_name, new_values, rows),
+                on_done=on_done
+            )
         
         ctk.CTkButton(edit_window, text="Save Changes", 
                      command=save_changes).pack(pady=10)
         
     def delete_selected_row(self):
-        selected_item = self.tree.selection()
-        if not selected_item:
+        rows = self.selected_rows()
+        if not rows:
             messagebox.showwarning("Warning", "Please select a row to delete")
             return
             
-        if not messagebox.askyesno("Confirm Delete", 
-                                 "Are you sure you want to delete this row?"):
+        prompt = ("Are you sure you want to delete this row?" if len(rows) == 1
+                  else f"Are you sure you want to delete these {len(rows)} rows?")
+        if not messagebox.askyesno("Confirm Delete", prompt):
             return
             
-        # Get the current values and columns
-        current_values = self.tree.item(selected_item[0])['values']
-        columns = self.tree["columns"]
-        
-        # Create WHERE clause using all columns for unique identification
-        where_conditions = []
-        for col, val in zip(columns, current_values):
-            if isinstance(val, str):
-                where_conditions.append(f"{col} = '{val}'")
-            else:
-                where_conditions.append(f"{col} = {val}")
-        where_clause = " AND ".join(where_conditions)
-        
         # Delete from database
-        success, message = self.db_manager.delete_row(
-            self.db_listbox.get(),
-            self.table_listbox.get(),
-            where_clause
-        )
+        db_name = self.db_listbox.get()
+        table_name = self.table_listbox.get()
         
-        if success:
-            self.show_table_data(self.table_listbox.get())
-        messagebox.showinfo("Delete Row", message)
+        def on_done(result):
+            success, message = result
+            if success:
+                self.reload_table_data()
+            messagebox.showinfo("Delete Row", message)
+            
+        self.jobs.submit(
+            f"Deleting {len(rows)} row(s) from {table_name}",
+            lambda job: self.db_manager.delete_rows(db_name, table_name, rows),
+            on_done=on_done
+        )
         
     def connect_to_db(self):
-        success, message = self.db_manager.connect(
-            self.host_entry.get(),
-            self.user_entry.get(),
-            self.pass_entry.get()
+        host = self.host_entry.get()
+        user = self.user_entry.get()
+        password = self.pass_entry.get()
+        
+        def on_done(result):
+            success, message = result
+            messagebox.showinfo("Connection", message)
+            if success:
+                self.refresh_database_list()
+                
+        self.jobs.submit(
+            f"Connecting to {host}",
+            lambda job: self.db_manager.connect(host, user, password),
+            on_done=on_done
         )
-        messagebox.showinfo("Connection", message)
-        if success:
-            self.refresh_database_list()
             
+    def setup_stats_tab(self):
+        frame = ctk.CTkFrame(self.tab_stats)
+        frame.pack(padx=10, pady=10, fill="both", expand=True)
+        
+        buttons_frame = ctk.CTkFrame(frame)
+        buttons_frame.pack(padx=10, pady=5, fill="x")
+        ctk.CTkButton(buttons_frame, text="🔄 Refresh", 
+                     command=self.refresh_query_stats).pack(side="left", padx=5)
+        ctk.CTkButton(buttons_frame, text="Reset", 
+                     command=self.reset_query_stats).pack(side="left", padx=5)
+        ctk.CTkLabel(buttons_frame, 
+                    text=f"Slow query threshold: {self.db_manager.stats.slow_threshold:g}s").pack(side="right", padx=5)
+        
+        columns = ("shape", "calls", "avg_ms", "p50_ms", "p99_ms", "rows", "bytes", "errors")
+        self.stats_tree = ttk.Treeview(frame, columns=columns, show="headings", height=12)
+        for col in columns:
+            self.stats_tree.heading(col, text=col)
+            self.stats_tree.column(col, width=500 if col == "shape" else 80, 
+                                   anchor="w" if col == "shape" else "e")
+        self.stats_tree.pack(padx=10, pady=5, fill="both", expand=True)
+        
+        ctk.CTkLabel(frame, text="Slow queries").pack(padx=10, anchor="w")
+        self.slow_queries_text = ctk.CTkTextbox(frame, height=180)
+        self.slow_queries_text.pack(padx=10, pady=5, fill="both", expand=True)
+        
+    def refresh_query_stats(self):
+        stats = self.db_manager.stats
+        self.stats_tree.delete(*self.stats_tree.get_children())
+        # Most total time first: that's where tuning pays off
+        for row in sorted(stats.query_summary(), key=lambda r: r['total_seconds'], reverse=True):
+            self.stats_tree.insert("", "end", values=(
+                row['shape'], row['calls'], f"{row['avg_seconds'] * 1000:.1f}",
+                f"{row['p50_seconds'] * 1000:g}", f"{row['p99_seconds'] * 1000:g}",
+                row['rows'], row['bytes'], row['errors']))
+        
+        self.slow_queries_text.delete("1.0", "end")
+        for entry in reversed(stats.slow_queries()):
+            when = time.strftime("%H:%M:%S", time.localtime(entry['time']))
+            self.slow_queries_text.insert("end", 
+                f"[{when}] {entry['seconds'] * 1000:.1f} ms, {entry['rows']} rows\n{entry['sql']}\n")
+            if entry['plan']:
+                self.slow_queries_text.insert("end", f"{entry['plan']}\n")
+            self.slow_queries_text.insert("end", "\n")
+            
+    def reset_query_stats(self):
+        self.db_manager.stats.reset()
+        self.refresh_query_stats()
+        
     def create_new_database(self):
         db_name = self.new_db_entry.get()
         if db_name:
-            success, message = self.db_manager.create_database(db_name)
-            messagebox.showinfo("Create Database", message)
-            if success:
-                self.refresh_database_list()
+            def on_done(result):
+                success, message = result
+                messagebox.showinfo("Create Database", message)
+                if success:
+                    self.refresh_database_list()
+                    
+            self.jobs.submit(
+                f"Creating database {db_name}",
+                lambda job: self.db_manager.create_database(db_name),
+                on_done=on_done
+            )
                 
     def refresh_database_list(self):
-        databases = self.db_manager.get_databases()
-        self.db_listbox.configure(values=databases)
-        self.import_db_menu.configure(values=databases)
+        def on_done(databases):
+            self.db_listbox.configure(values=databases)
+            self.import_db_menu.configure(values=databases)
+            self.console_db_menu.configure(values=databases)
+            
+        self.jobs.submit("Loading databases", lambda job: self.db_manager.get_databases(),
+                         on_done=on_done)
         
     def on_database_select(self, db_name):
-        tables = self.db_manager.get_tables(db_name)
-        self.table_listbox.configure(values=tables)
+        self.jobs.submit(
+            f"Loading tables of {db_name}",
+            lambda job: self.db_manager.get_tables(db_name),
+            on_done=lambda tables: self.table_listbox.configure(values=tables)
+        )
+        
+    def refresh_tables(self):
+        # Refresh is explicit, so drop the cached schema before reloading
+        db_name = self.db_listbox.get()
+        self.db_manager.invalidate_metadata(db_name)
+        self.on_database_select(db_name)
         
     def show_table_data(self, table_name):
         if not table_name:
             return
+        # A newly picked table starts unfiltered, unsorted and with all columns
+        self.table_view = {"filters": [], "sort": None, "columns": None}
+        self.filter_label.configure(text="")
+        self.reload_table_data()
+        
+    def reload_table_data(self):
+        db_name = self.db_listbox.get()
+        table_name = self.table_listbox.get()
+        if not db_name or not table_name:
+            return
+        view = dict(self.table_view)
+        page_size = self.pager.page_size
+        
+        def load_first_page(job):
+            info = self.db_manager.get_table_info(db_name, table_name) or {}
+            primary_key = info.get("primary_key", [])
+            plan = {"key_columns": list(primary_key), "order_by": [], "descending": False,
+                    "filters": view["filters"], "columns": None}
+            if view["sort"] is not None:
+                sort_column, plan["descending"] = view["sort"]
+                tiebreak = [col for col in primary_key if col != sort_column]
+                if primary_key and sort_column not in info.get("nullable", ()):
+                    plan["key_columns"] = [sort_column] + tiebreak
+                else:
+                    # NULLs break row-value comparisons, so page by offset
+                    plan["key_columns"] = []
+                    plan["order_by"] = [sort_column] + tiebreak
+            if view["columns"]:
+                # Rows still need their key for edits and paging; keyless
+                # tables are matched on every column, so they fetch them all
+                row_key = self.db_manager.row_key(db_name, table_name)
+                if row_key:
+                    needed = view["columns"] + row_key + plan["key_columns"] + plan["order_by"]
+                    plan["columns"] = list(dict.fromkeys(needed))
+            columns, rows = self.db_manager.get_table_page(db_name, table_name, page_size, **plan)
+            estimate = None if view["filters"] else info.get("rows")
+            return plan, columns, rows, estimate, info.get("columns", columns)
+            
+        def on_done(result):
+            plan, columns, rows, estimate, all_columns = result
+            self.pager.load(columns, rows,
+                            self._table_page_fetcher(db_name, table_name, columns, plan),
+                            total_hint=estimate)
+            shown = [col for col in view["columns"] or columns if col in columns]
+            self.tree["displaycolumns"] = shown if view["columns"] else "#all"
+            for col in columns:
+                arrow = ""
+                if view["sort"] is not None and view["sort"][0] == col:
+                    arrow = " ▼" if view["sort"][1] else " ▲"
+                self.tree.heading(col, text=col + arrow, 
+                                  command=lambda c=col: self.sort_table_by(c))
+            self.filter_column_menu.configure(values=list(all_columns))
+            if self.filter_column_menu.get() not in all_columns:
+                self.filter_column_menu.set(all_columns[0] if all_columns else "")
+            
+        def on_error(error):
+            if error is not None:
+                messagebox.showerror("Error", f"Could not load {table_name}: {error}")
+                
+        self.jobs.submit(f"Loading {table_name}", load_first_page, on_done=on_done,
+                         on_error=on_error)
+        
+    def sort_table_by(self, column):
+        # Ascending, then descending, then back to primary key order
+        sort = self.table_view["sort"]
+        if sort is None or sort[0] != column:
+            self.table_view["sort"] = (column, False)
+        elif not sort[1]:
+            self.table_view["sort"] = (column, True)
+        else:
+            self.table_view["sort"] = None
+        self.reload_table_data()
+        
+    def add_table_filter(self):
+        column = self.filter_column_menu.get()
+        operator = self.filter_operator_menu.get()
+        value = self.filter_value_entry.get()
+        if not column:
+            messagebox.showwarning("Warning", "Please select a table first")
+            return
+        if operator in ("IS NULL", "IS NOT NULL"):
+            value = None
+        elif operator == "IN" and not split_columns(value):
+            messagebox.showwarning("Warning", "IN needs a comma separated list of values")
+            return
+        self.table_view["filters"].append((column, operator, value))
+        self.filter_value_entry.delete(0, "end")
+        self.filter_label.configure(text=" AND ".join(
+            f"{col} {op}" + ("" if val is None else f" {val!r}")
+            for col, op, val in self.table_view["filters"]))
+        self.reload_table_data()
+        
+    def clear_table_filters(self):
+        self.table_view["filters"] = []
+        self.filter_label.configure(text="")
+        self.reload_table_data()
+        
+    def choose_table_columns(self):
+        all_columns = self.filter_column_menu.cget("values")
+        if not all_columns:
+            messagebox.showwarning("Warning", "Please select a table first")
+            return
+        chosen = self.table_view["columns"] or list(all_columns)
+        
+        window = ctk.CTkToplevel(self)
+        window.title("Columns")
+        window.geometry("300x400")
+        frame = ctk.CTkScrollableFrame(window)
+        frame.pack(padx=10, pady=10, fill="both", expand=True)
+        variables = {}
+        for col in all_columns:
+            variables[col] = ctk.BooleanVar(value=col in chosen)
+            ctk.CTkCheckBox(frame, text=col, variable=variables[col]).pack(padx=5, pady=2, anchor="w")
+            
+        def apply():
+            selected = [col for col in all_columns if variables[col].get()]
+            if not selected:
+                messagebox.showwarning("Warning", "Select at least one column", parent=window)
+                return
+            self.table_view["columns"] = None if len(selected) == len(all_columns) else selected
+            window.destroy()
+            self.reload_table_data()
             
-        # Clear existing columns
-        for col in self.tree["columns"]:
-            self.tree.heading(col, text="")
+        ctk.CTkButton(window, text="Apply", command=apply).pack(pady=10)
         
-        # Get and display new data
-        columns, data = self.db_manager.get_table_data(
-            self.db_listbox.get(),
-            table_name
-        )
+    def _table_page_fetcher(self, db_name, table_name, columns, plan):
+        key_columns = plan["key_columns"]
+        key_index = [columns.index(col) for col in key_columns]
+        page_size = self.pager.page_size
         
-        # Configure columns
-        self.tree["columns"] = columns
-        for col in columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, minwidth=100, width=150)
+        def fetch(direction, boundary, offset, callback):
+            kwargs = dict(plan)
+            limit = page_size
+            if key_columns:
+                key = tuple(boundary[i] for i in key_index)
+                kwargs[direction] = key
+            elif direction == "before":
+                kwargs["offset"] = max(offset - page_size, 0)
+                limit = offset - kwargs["offset"]
+            else:
+                kwargs["offset"] = offset
+            self.jobs.submit(
+                f"Loading rows of {table_name}",
+                lambda job: self.db_manager.get_table_page(db_name, table_name, limit, **kwargs)[1],
+                on_done=callback,
+                on_error=lambda error: callback(None)
+            )
+            
+        return fetch
+            
+    def export_table_data(self):
+        db_name = self.db_listbox.get()
+        table_name = self.table_listbox.get()
+        if not db_name or not table_name:
+            messagebox.showwarning("Warning", "Please select a table to export")
+            return
+            
+        output_path = filedialog.asksaveasfilename(
+            initialfile=f"{table_name}.csv",
+            filetypes=[("CSV files", "*.csv"), ("Gzip CSV files", "*.csv.gz"),
+                       ("Parquet files", "*.parquet")]
+        )
+        if not output_path:
+            return
+            
+        def run(job):
+            def on_rows(rows_done, rate):
+                job.report(f"Exporting {table_name}: {rows_done:,} rows ({rate:,.0f} rows/sec)")
+            return self.db_manager.export_table(
+                db_name, table_name, output_path,
+                progress_callback=on_rows, cancel_event=job.cancel_event
+            )
             
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        def on_done(result):
+            success, message = result
+            messagebox.showinfo("Export", message)
             
-        # Add data
-        for row in data:
-            self.tree.insert("", "end", values=row)
+        self.jobs.submit(f"Exporting {table_name}", run, on_done=on_done)
             
     def select_csv(self):
         file_path = filedialog.askopenfilename(
@@ -396,8 +2557,39 @@ class App(ctk.CTk):
         if file_path:
             self.csv_label.configure(text=file_path)
             self.csv_path = file_path
+            self.csv_folder = None
+            
+    def select_csv_folder(self):
+        folder = filedialog.askdirectory()
+        if folder:
+            count = len(csv_sources(folder))
+            self.csv_label.configure(text=f"{folder} ({count} CSV files)")
+            self.csv_folder = folder
+            if hasattr(self, 'csv_path'):
+                del self.csv_path
+            
+    def preview_csv_types(self):
+        if not hasattr(self, 'csv_path'):
+            messagebox.showerror("Error", "Please select a CSV file first!")
+            return
+        def on_done(schema):
+            messagebox.showinfo(
+                "Inferred Types",
+                "\n".join(f"{col}: {dtype}" for col, dtype in schema)
+            )
+            
+        def on_error(error):
+            if error is not None:
+                messagebox.showerror("Error", f"Error: {error}")
+                
+        csv_path = self.csv_path
+        self.jobs.submit("Inferring column types", lambda job: infer_csv_schema(csv_path),
+                         on_done=on_done, on_error=on_error)
             
     def import_csv_to_db(self):
+        if getattr(self, 'csv_folder', None):
+            self.import_csv_folder()
+            return
         if not hasattr(self, 'csv_path'):
             messagebox.showerror("Error", "Please select a CSV file first!")
             return
@@ -409,11 +2601,159 @@ class App(ctk.CTk):
             messagebox.showerror("Error", "Please select a database and enter a table name!")
             return
             
-        success, message = self.db_manager.import_csv(db_name, table_name, self.csv_path)
-        messagebox.showinfo("Import CSV", message)
-        if success:
+        try:
+            chunk_size = int(self.import_chunk_entry.get())
+        except ValueError:
+            messagebox.showerror("Error", "Rows per commit must be a whole number!")
+            return
+            
+        csv_path = self.csv_path
+        options = {
+            "chunk_size": max(chunk_size, 1),
+            "infer_types": self.infer_types_var.get(),
+            "primary_key": split_columns(self.import_pk_entry.get()),
+            "auto_id": self.auto_id_var.get(),
+            "indexes": split_columns(self.import_index_entry.get()),
+            "sync_key": split_columns(self.import_sync_key_entry.get()),
+        }
+        if self.delete_missing_var.get():
+            if not options["sync_key"]:
+                messagebox.showerror("Error", "Deleting missing rows needs sync key column(s)!")
+                return
+            if not messagebox.askyesno(
+                    "Import CSV", f"Rows of '{table_name}' whose key is not in the file "
+                                  "will be deleted. Continue?"):
+                return
+            options["delete_missing"] = True
+        
+        def run(job):
+            def on_rows(rows_done, rate):
+                job.report(f"Importing {table_name}: {rows_done:,} rows "
+                           f"({rate:,.0f} rows/sec)")
+            return self.db_manager.import_csv(
+                db_name, table_name, csv_path,
+                progress_callback=on_rows, cancel_event=job.cancel_event, **options
+            )
+            
+        def on_done(result):
+            success, message = result
+            self.import_progress_label.configure(text="")
+            messagebox.showinfo("Import CSV", message)
+            if success:
+                self.on_database_select(db_name)
+                
+        def on_error(error):
+            self.import_progress_label.configure(text="")
+            if error is None:
+                messagebox.showinfo("Import CSV", "Import cancelled; import again to resume")
+            else:
+                messagebox.showerror("Import CSV", f"Error: {error}")
+                
+        self.jobs.submit(
+            f"Importing {table_name}", run, on_done=on_done, on_error=on_error,
+            on_progress=lambda status, progress: self.import_progress_label.configure(text=status)
+        )
+
+    def import_csv_folder(self):
+        db_name = self.import_db_menu.get()
+        folder = self.csv_folder
+        if not db_name:
+            messagebox.showerror("Error", "Please select a database!")
+            return
+
+        try:
+            chunk_size = int(self.import_chunk_entry.get())
+            max_workers = int(self.import_workers_entry.get())
+        except ValueError:
+            messagebox.showerror("Error", "Rows per commit and workers must be whole numbers!")
+            return
+
+        try:
+            table_for = shard_table_mapper(TABLE_MAPPINGS[self.import_mapping_menu.get()],
+                                           self.import_table_entry.get().strip())
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+
+        csv_paths = csv_sources(folder)
+        if not csv_paths:
+            messagebox.showerror("Error", "The selected folder contains no CSV files!")
+            return
+
+        options = {
+            "chunk_size": max(chunk_size, 1),
+            "max_workers": max(max_workers, 1),
+            "infer_types": self.infer_types_var.get(),
+            "primary_key": split_columns(self.import_pk_entry.get()),
+            "auto_id": self.auto_id_var.get(),
+            "indexes": split_columns(self.import_index_entry.get()),
+        }
+
+        def run(job):
+            def on_files(files_done, files_total, rows_done, rate):
+                job.report(f"Importing {files_done}/{files_total} files: {rows_done:,} rows "
+                           f"({rate:,.0f} rows/sec)", files_done / max(files_total, 1))
+            return self.db_manager.import_csv_batch(
+                db_name, csv_paths, table_for,
+                progress_callback=on_files, cancel_event=job.cancel_event, **options
+            )
+
+        def on_done(result):
+            success, message = result
+            self.import_progress_label.configure(text="")
+            if success:
+                messagebox.showinfo("Import CSV", message)
+            else:
+                messagebox.showwarning("Import CSV", message)
             self.on_database_select(db_name)
 
+        def on_error(error):
+            self.import_progress_label.configure(text="")
+            if error is None:
+                messagebox.showinfo("Import CSV", "Import cancelled; import again to resume")
+            else:
+                messagebox.showerror("Import CSV", f"Error: {error}")
+
+        self.jobs.submit(
+            f"Importing {len(csv_paths)} files", run, on_done=on_done, on_error=on_error,
+            on_progress=lambda status, progress: self.import_progress_label.configure(text=status)
+        )
+
+def run_export(argv):
+    # Headless entry point, e.g. for cron:
+    #   MYSQL_PWD=secret python app.py export --database world --table country --output country.csv.gz
+    parser = argparse.ArgumentParser(prog="app.py export",
+                                     description="Stream a table to CSV, gzip CSV or Parquet")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default=os.environ.get("MYSQL_PWD", ""),
+                        help="defaults to the MYSQL_PWD environment variable")
+    parser.add_argument("--database", required=True)
+    parser.add_argument("--table", required=True)
+    parser.add_argument("--output", required=True,
+                        help="target file; .csv, .csv.gz or .parquet")
+    parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+    
+    db_manager = DatabaseManager(pool_size=1)
+    success, message = db_manager.connect(args.host, args.user, args.password)
+    if not success:
+        print(message, file=sys.stderr)
+        return 1
+        
+    def on_progress(rows_done, rate):
+        print(f"\r{rows_done:,} rows ({rate:,.0f} rows/sec)", end="", file=sys.stderr)
+        
+    success, message = db_manager.export_table(
+        args.database, args.table, args.output,
+        batch_size=args.batch_size, progress_callback=on_progress
+    )
+    print(file=sys.stderr)
+    print(message, file=sys.stdout if success else sys.stderr)
+    return 0 if success else 1
+
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["export"]:
+        sys.exit(run_export(sys.argv[2:]))
     app = App()
     app.mainloop()
\ No newline at end of file
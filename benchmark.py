@@ -0,0 +1,583 @@
+import argparse
+import csv
+import datetime
+import http.client
+import importlib.util
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import quote, urlencode, urlsplit
+
+try:
+    import resource
+except ImportError:  # Windows: peak RSS is reported as null
+    resource = None
+
+# Reproducible benchmarks for the desktop import/browse paths and the Flask API.
+#
+#   python benchmark.py generate --rows 1M
+#   MYSQL_PWD=secret python benchmark.py run --rows 1K,100K,1M --report after.json
+#   python benchmark.py api --countries 5000 --concurrency 16 --report api.json
+#   python benchmark.py compare before.json after.json
+#
+# import and browse need a local MySQL/MariaDB server. The API benchmark runs the
+# Flask app in-process against DATABASE_URL, defaulting to a seeded SQLite file,
+# or against a running server with --url.
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+FLASK_APP_PATH = os.path.join(ROOT, "flask_app", "app.py")
+DEFAULT_DATA_DIR = os.path.join(ROOT, "bench_data")
+DEFAULT_ROWS = "1K,100K"
+DEFAULT_SEED = 42
+BROWSE_PAGE_SIZE = 200  # matches PagedTreeview
+BROWSE_PAGES = 20
+FULL_LOAD_MAX_ROWS = 1_000_000  # get_table_data loads everything; skip it above this
+HIGHER_IS_BETTER = ("rows_per_sec", "rps")
+LOWER_IS_BETTER = ("_ms", "_seconds", "_mb", "errors")
+
+CATEGORIES = ("alpha", "beta", "gamma", "delta", "epsilon", "zeta", "eta", "theta")
+WORDS = ("lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing", "elit",
+         "sed", "do", "eiusmod", "tempor", "incididunt", "labore", "magna", "aliqua")
+CONTINENTS = ("Africa", "Antarctica", "Asia", "Australia", "Central America", "Europe",
+              "North America", "South America")
+SYLLABLES = ("ba", "ca", "da", "fe", "ga", "hi", "jo", "ka", "li", "mo", "na", "po",
+             "ra", "si", "ta", "vu", "wa", "ya", "zo", "en", "ar", "is", "ul", "or")
+
+def parse_count(text):
+    text = text.strip().upper()
+    scale = {"K": 1_000, "M": 1_000_000}.get(text[-1:], 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+def parse_counts(text):
+    return [parse_count(part) for part in text.split(",") if part.strip()]
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(q * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+def run_isolated(func, *args):
+    # A fresh interpreter per measurement keeps peak RSS and caches independent
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(func, args)
+
+# Synthetic data
+
+def synthetic_csv_path(data_dir, rows, seed):
+    return os.path.join(data_dir, f"bench_{rows}_{seed}.csv")
+
+def generate_csv(path, rows, seed=DEFAULT_SEED):
+    # Mixed types so import exercises type inference and value conversion:
+    # integers, floats, booleans, dates, datetimes, NULLs and free text
+    rng = random.Random(seed)
+    base = datetime.datetime(2020, 1, 1)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "name", "category", "amount", "quantity", "active",
+                         "created_on", "updated_at", "notes"])
+        batch = []
+        for i in range(1, rows + 1):
+            moment = base + datetime.timedelta(seconds=rng.randrange(5 * 365 * 86400))
+            batch.append((
+                i,
+                f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} {i}",
+                rng.choice(CATEGORIES),
+                f"{rng.uniform(-10000, 10000):.2f}",
+                "" if rng.random() < 0.05 else rng.randrange(1000),
+                rng.choice(("true", "false")),
+                moment.date().isoformat(),
+                moment.isoformat(sep=" "),
+                " ".join(rng.choices(WORDS, k=rng.randrange(0, 30))),
+            ))
+            if len(batch) == 10_000:
+                writer.writerows(batch)
+                batch.clear()
+        writer.writerows(batch)
+    os.replace(tmp_path, path)
+    return path
+
+def ensure_csv(data_dir, rows, seed):
+    path = synthetic_csv_path(data_dir, rows, seed)
+    if not os.path.exists(path):
+        started = time.perf_counter()
+        generate_csv(path, rows, seed)
+        print(f"Generated {path} ({rows:,} rows, {time.perf_counter() - started:.1f}s)",
+              file=sys.stderr)
+    return path
+
+def synthetic_countries(count, seed=DEFAULT_SEED):
+    rng = random.Random(seed)
+    names = set()
+    countries = []
+    while len(countries) < count:
+        name = "".join(rng.choices(SYLLABLES, k=rng.randrange(2, 5))).title()
+        if name in names:
+            name = f"{name} {len(countries)}"
+        names.add(name)
+        # Uniform over the sphere rather than over the lat/lon rectangle
+        lat = math.degrees(math.asin(rng.uniform(-1, 1)))
+        countries.append({
+            "CountryName": name,
+            "CapitalName": "".join(rng.choices(SYLLABLES, k=3)).title(),
+            "CapitalLatitude": round(lat, 4),
+            "CapitalLongitude": round(rng.uniform(-180, 180), 4),
+            "CountryCode": "".join(rng.choices("ABCDEFGHIJKLMNOPQRSTUVWXYZ", k=3)),
+            "ContinentName": rng.choice(CONTINENTS),
+        })
+    return countries
+
+# Import and browse (MySQL)
+
+def mysql_config(args):
+    return {"host": args.host, "user": args.user, "password": args.password}
+
+def bench_table(rows):
+    return f"bench_{rows}"
+
+def admin_execute(config, statements, database=None):
+    import mysql.connector
+    connection = mysql.connector.connect(database=database, **config)
+    try:
+        cursor = connection.cursor()
+        results = []
+        for statement in statements:
+            cursor.execute(statement)
+            results.append(cursor.fetchall() if cursor.with_rows else None)
+        connection.commit()
+        return results
+    finally:
+        connection.close()
+
+def import_worker(config, database, table, csv_path, chunk_size):
+    from app import DatabaseManager
+    manager = DatabaseManager(pool_size=1)
+    success, message = manager.connect(config["host"], config["user"], config["password"])
+    if not success:
+        return {"error": message}
+    baseline_mb = peak_rss_mb()
+    insert_rate = []
+    started = time.perf_counter()
+    success, message = manager.import_csv(
+        database, table, csv_path, chunk_size=chunk_size, resume=False, primary_key=("id",),
+        progress_callback=lambda rows_done, rate: insert_rate.append(rate)
+    )
+    elapsed = time.perf_counter() - started
+    if not success:
+        return {"error": message}
+    return {"seconds": elapsed, "insert_rows_per_sec": insert_rate[-1] if insert_rate else 0.0,
+            "baseline_rss_mb": baseline_mb, "peak_rss_mb": peak_rss_mb()}
+
+def bench_import(args, config, counts):
+    from app import quote_identifier
+    admin_execute(config, [f"CREATE DATABASE IF NOT EXISTS {quote_identifier(args.database)}"])
+    results = {}
+    for rows in counts:
+        csv_path = ensure_csv(args.data_dir, rows, args.seed)
+        table = bench_table(rows)
+        admin_execute(config, [f"DROP TABLE IF EXISTS {quote_identifier(table)}"], args.database)
+        result = run_isolated(import_worker, config, args.database, table, csv_path,
+                              args.chunk_size)
+        if "error" not in result:
+            result["rows"] = rows
+            result["rows_per_sec"] = rows / result["seconds"]
+        results[str(rows)] = result
+        print(f"import {rows:>10,} rows: {json.dumps(result)}", file=sys.stderr)
+    return results
+
+def browse_worker(config, database, table, mode):
+    from app import DatabaseManager
+    manager = DatabaseManager(pool_size=1)
+    started = time.perf_counter()
+    success, message = manager.connect(config["host"], config["user"], config["password"])
+    if not success:
+        return {"error": message}
+    result = {"connect_seconds": time.perf_counter() - started, "baseline_rss_mb": peak_rss_mb()}
+
+    started = time.perf_counter()
+    if mode == "full":
+        columns, rows = manager.get_table_data(database, table)
+        result["first_row_seconds"] = time.perf_counter() - started
+        result["rows_loaded"] = len(rows)
+    else:
+        # The same calls the Explorer tab makes: key lookup, then keyset pages
+        key_columns = manager.get_primary_key(database, table)
+        columns, rows = manager.get_table_page(database, table, BROWSE_PAGE_SIZE, key_columns)
+        result["first_row_seconds"] = time.perf_counter() - started
+        page_times = []
+        while rows and len(page_times) < BROWSE_PAGES:
+            after = tuple(rows[-1][columns.index(col)] for col in key_columns)
+            page_started = time.perf_counter()
+            columns, rows = manager.get_table_page(database, table, BROWSE_PAGE_SIZE,
+                                                   key_columns, after=after or None,
+                                                   offset=BROWSE_PAGE_SIZE * (len(page_times) + 1))
+            page_times.append(time.perf_counter() - page_started)
+        if page_times:
+            result["next_page_ms"] = 1000 * sum(page_times) / len(page_times)
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+def bench_browse(args, config, counts):
+    from app import quote_literal
+    results = {}
+    for rows in counts:
+        table = bench_table(rows)
+        existing = admin_execute(config, [
+            "SELECT 1 FROM information_schema.TABLES "
+            f"WHERE TABLE_SCHEMA = {quote_literal(args.database)} "
+            f"AND TABLE_NAME = {quote_literal(table)}"
+        ])[0]
+        if not existing:
+            print(f"{table} missing, importing it first", file=sys.stderr)
+            bench_import(args, config, [rows])
+        results[str(rows)] = {"paged": run_isolated(browse_worker, config, args.database,
+                                                    table, "paged")}
+        if rows <= FULL_LOAD_MAX_ROWS:
+            results[str(rows)]["full"] = run_isolated(browse_worker, config, args.database,
+                                                      table, "full")
+        print(f"browse {rows:>10,} rows: {json.dumps(results[str(rows)])}", file=sys.stderr)
+    return results
+
+# API
+
+class InProcessClient:
+    # Flask test client per thread; exercises the app without socket overhead
+    def __init__(self, app):
+        self.app = app
+        self.local = threading.local()
+
+    def get(self, path):
+        client = getattr(self.local, "client", None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+        response = client.get(path)
+        return response.status_code, len(response.get_data())
+
+class HttpClient:
+    # One keep-alive connection per thread against a running server
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port
+        self.prefix = parts.path.rstrip("/")
+        self.connection_class = (http.client.HTTPSConnection if parts.scheme == "https"
+                                 else http.client.HTTPConnection)
+        self.local = threading.local()
+
+    def get(self, path):
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = self.local.connection = self.connection_class(self.host, self.port,
+                                                                       timeout=60)
+        try:
+            connection.request("GET", self.prefix + path, headers={"Accept-Encoding": "gzip"})
+            response = connection.getresponse()
+            return response.status, len(response.read())
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            self.local.connection = None
+            raise
+
+def load_flask_app(data_dir, countries, seed):
+    database_url = os.environ.setdefault(
+        "DATABASE_URL",
+        "sqlite:///" + os.path.abspath(os.path.join(data_dir, f"countries_{countries}_{seed}.db"))
+    )
+    if database_url.startswith("sqlite:///"):
+        os.makedirs(data_dir, exist_ok=True)
+    spec = importlib.util.spec_from_file_location("flask_api", FLASK_APP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["flask_api"] = module
+    spec.loader.exec_module(module)
+    with module.app.app_context():
+        module.db.create_all()
+        # Only an empty table is seeded, so a real database is never modified
+        if module.db.session.query(module.Country).count() == 0:
+            module.db.session.execute(module.db.insert(module.Country),
+                                      synthetic_countries(countries, seed))
+            module.db.session.commit()
+    module.warm_up()
+    return module.app
+
+def fetch_countries(client):
+    # Sample data comes from the API itself so --url and in-process match
+    path = "/api/countries/export?format=ndjson&gzip=false"
+    if isinstance(client, InProcessClient):
+        body = client.app.test_client().get(path).get_data(as_text=True)
+    else:
+        connection = client.connection_class(client.host, client.port, timeout=60)
+        try:
+            connection.request("GET", client.prefix + path)
+            body = connection.getresponse().read().decode("utf-8")
+        finally:
+            connection.close()
+    return [json.loads(line) for line in body.splitlines() if line.strip()]
+
+def api_scenarios(countries, rng, variants=200):
+    if not countries:
+        raise ValueError("The country table is empty")
+    sample = [rng.choice(countries) for _ in range(variants)]
+    names = [c["country_name"] for c in countries]
+    continents = sorted({c["continent_name"] for c in countries if c["continent_name"]})
+    pages = max(len(countries) // 50, 1)
+
+    def point(c):
+        return {"lat": c["capital_latitude"], "lon": c["capital_longitude"]}
+
+    return {
+        "countries_page": [f"/api/countries?page={rng.randrange(1, pages + 1)}&per_page=50"
+                           for _ in range(variants)],
+        "countries_cursor": ["/api/countries?pagination=cursor&per_page=50"],
+        "country_detail": [f"/api/countries/{quote(c['country_name'], safe='')}" for c in sample],
+        "search": ["/api/countries/search?" + urlencode({"q": c["country_name"][:4]})
+                   for c in sample],
+        "batch": ["/api/countries/batch?" + urlencode({"names": ",".join(rng.sample(names, min(20, len(names))))})
+                  for _ in range(variants)],
+        "continent": [f"/api/countries/continent/{quote(name, safe='')}" for name in continents],
+        "nearest": ["/api/countries/nearest?" + urlencode(dict(point(c), k=5)) for c in sample],
+        "within": ["/api/countries/within?" + urlencode(dict(point(c), radius_km=500))
+                   for c in sample],
+        "continents": ["/api/continents"],
+        "stats": ["/api/stats"],
+        "export": ["/api/countries/export?format=ndjson"],
+    }
+
+def run_scenario(client, paths, requests, concurrency, warmup):
+    for i in range(warmup):
+        client.get(paths[i % len(paths)])
+    per_thread = max(requests // concurrency, 1)
+    latencies = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+    nbytes = [0] * concurrency
+
+    def worker(index):
+        # Threads start at different offsets so they don't request in lockstep
+        for i in range(per_thread):
+            path = paths[(index * per_thread + i) % len(paths)]
+            started = time.perf_counter()
+            try:
+                status, size = client.get(path)
+            except Exception:
+                status, size = 599, 0
+            latencies[index].append(time.perf_counter() - started)
+            nbytes[index] += size
+            if status >= 400:
+                errors[index] += 1
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    samples = sorted(value for values in latencies for value in values)
+    return {
+        "requests": len(samples),
+        "errors": sum(errors),
+        "rps": len(samples) / elapsed,
+        "mean_ms": 1000 * sum(samples) / len(samples),
+        "p50_ms": 1000 * percentile(samples, 0.5),
+        "p99_ms": 1000 * percentile(samples, 0.99),
+        "bytes_per_request": sum(nbytes) / len(samples),
+    }
+
+def bench_api(args):
+    if args.url:
+        client = HttpClient(args.url)
+        target = args.url
+    else:
+        client = InProcessClient(load_flask_app(args.data_dir, args.countries, args.seed))
+        target = "in-process " + urlsplit(os.environ["DATABASE_URL"]).scheme
+    countries = fetch_countries(client)
+    scenarios = api_scenarios(countries, random.Random(args.seed))
+    selected = args.endpoints.split(",") if args.endpoints else list(scenarios)
+
+    results = {"config": {"target": target, "countries": len(countries),
+                          "concurrency": args.concurrency, "requests": args.requests},
+               "endpoints": {}}
+    for name in selected:
+        # Streaming export is far heavier per request than the JSON lookups
+        requests = max(args.requests // 20, args.concurrency) if name == "export" else args.requests
+        result = run_scenario(client, scenarios[name], requests, args.concurrency, args.warmup)
+        results["endpoints"][name] = result
+        print(f"api {name:<18} p50 {result['p50_ms']:7.2f} ms  p99 {result['p99_ms']:7.2f} ms  "
+              f"{result['rps']:8.0f} req/s  errors {result['errors']}", file=sys.stderr)
+    return results
+
+# Reports
+
+def report_meta(args):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    return {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "command": args.command,
+        "git_commit": commit or None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "seed": args.seed,
+    }
+
+def write_report(args, sections):
+    report = {"meta": report_meta(args)}
+    report.update(sections)
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"Report written to {args.report}", file=sys.stderr)
+
+def flatten_metrics(report, prefix=""):
+    metrics = {}
+    for key, value in report.items():
+        if key in ("meta", "config"):
+            continue
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            metrics.update(flatten_metrics(value, name))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            metrics[name] = value
+    return metrics
+
+def metric_direction(name):
+    leaf = name.rsplit(".", 1)[-1]
+    if leaf.endswith(HIGHER_IS_BETTER):
+        return 1
+    if leaf.endswith(LOWER_IS_BETTER):
+        return -1
+    return 0
+
+def compare_reports(baseline, current, threshold):
+    old, new = flatten_metrics(baseline), flatten_metrics(current)
+    rows, regressions = [], []
+    for name in sorted(old.keys() & new.keys()):
+        direction = metric_direction(name)
+        if direction == 0:
+            continue
+        before, after = old[name], new[name]
+        change = (after - before) / before if before else (0.0 if after == before else math.inf)
+        verdict = ""
+        if change * direction < -threshold:
+            verdict = "REGRESSION"
+            regressions.append(name)
+        elif change * direction > threshold:
+            verdict = "improved"
+        rows.append((name, before, after, change, verdict))
+    return rows, regressions
+
+# Command line
+
+def add_mysql_arguments(parser):
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default=os.environ.get("MYSQL_PWD", ""),
+                        help="defaults to the MYSQL_PWD environment variable")
+    parser.add_argument("--database", default="benchmark",
+                        help="scratch database; bench_<rows> tables are dropped and recreated")
+    parser.add_argument("--chunk-size", type=int, default=10000)
+
+def add_api_arguments(parser):
+    parser.add_argument("--url", help="benchmark a running server instead of the in-process app")
+    parser.add_argument("--countries", type=parse_count, default=5000,
+                        help="synthetic countries seeded into an empty table")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--endpoints", help="comma separated subset, e.g. search,nearest")
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="benchmark.py",
+                                     description="Benchmark CSV import, table browsing and the API")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    common.add_argument("--seed", type=int, default=DEFAULT_SEED)
+
+    generate = commands.add_parser("generate", parents=[common], help="write synthetic CSVs")
+    generate.add_argument("--rows", default=DEFAULT_ROWS, help="e.g. 1K,100K,10M")
+
+    for name, help_text in (("import", "CSV import throughput"),
+                            ("browse", "time to first row and peak RSS"),
+                            ("api", "API latency and throughput"),
+                            ("run", "import, browse and api in one report")):
+        command = commands.add_parser(name, parents=[common], help=help_text)
+        command.add_argument("--report", default=f"benchmark_{name}.json")
+        if name != "api":
+            command.add_argument("--rows", default=DEFAULT_ROWS, help="e.g. 1K,100K,10M")
+            add_mysql_arguments(command)
+        if name in ("api", "run"):
+            add_api_arguments(command)
+
+    compare = commands.add_parser("compare", help="diff a report against a baseline")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=0.10,
+                         help="relative change treated as significant (default 0.10)")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.command == "generate":
+        for rows in parse_counts(args.rows):
+            print(ensure_csv(args.data_dir, rows, args.seed))
+        return 0
+
+    if args.command == "compare":
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        with open(args.current, encoding="utf-8") as f:
+            current = json.load(f)
+        rows, regressions = compare_reports(baseline, current, args.threshold)
+        width = max((len(row[0]) for row in rows), default=10)
+        for name, before, after, change, verdict in rows:
+            print(f"{name:<{width}}  {before:>12.3f}  {after:>12.3f}  {change:>+8.1%}  {verdict}")
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+        return 1 if regressions else 0
+
+    sections = {}
+    if args.command in ("import", "browse", "run"):
+        config = mysql_config(args)
+        counts = parse_counts(args.rows)
+        try:
+            admin_execute(config, ["SELECT 1"])
+        except Exception as e:
+            if args.command != "run":
+                print(f"Error: {e}", file=sys.stderr)
+                return 1
+            # run still produces the API section without a MySQL server
+            print(f"Skipping import and browse: {e}", file=sys.stderr)
+            sections["import"] = sections["browse"] = {"skipped": str(e)}
+        else:
+            if args.command in ("import", "run"):
+                sections["import"] = bench_import(args, config, counts)
+            if args.command in ("browse", "run"):
+                sections["browse"] = bench_browse(args, config, counts)
+    if args.command in ("api", "run"):
+        sections["api"] = bench_api(args)
+    write_report(args, sections)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""Query and HTTP request timing shared by the desktop app and the Flask API"""
+from bisect import bisect_left
+from collections import deque
+import os
+import re
+import threading
+import time
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLOW_QUERY_SECONDS = float(os.environ.get('SLOW_QUERY_SECONDS', 0.5))
+MAX_SLOW_QUERIES = 50
+MAX_SHAPES = 500  # bounds label cardinality; extra shapes are folded into "other"
+
+_DOUBLE_QUOTED = re.compile(r'"(?:[^"\\]|\\.)*"')
+_SHAPE_PATTERNS = (
+    (re.compile(r"'(?:[^'\\]|\\.|'')*'"), '?'),
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'%s'), '?'),
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)'), '(...)'),
+    (re.compile(r'IN\s*\(\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))*\)', re.IGNORECASE), 'IN (...)'),
+    (re.compile(r'\s+'), ' '),
+)
+
+def query_shape(sql, double_quoted_strings=False):
+    """SQL with literals and placeholder lists collapsed, e.g. 'WHERE id IN (...)'
+
+    Double quotes delimit strings only in MySQL without ANSI_QUOTES;
+    elsewhere they quote identifiers, which belong to the shape.
+    """
+    shape = sql.strip()
+    if double_quoted_strings:
+        shape = _DOUBLE_QUOTED.sub('?', shape)
+    for pattern, replacement in _SHAPE_PATTERNS:
+        shape = pattern.sub(replacement, shape)
+    return shape
+
+def estimate_bytes(rows):
+    """Rough payload size of fetched rows; drivers don't expose wire bytes"""
+    total = 0
+    for row in rows:
+        for value in row:
+            total += len(value) if isinstance(value, (str, bytes, bytearray)) else 8
+    return total
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th observation"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float('inf')
+
+class QueryShapeStats:
+    def __init__(self, shape):
+        self.shape = shape
+        self.latency = Histogram()
+        self.rows = 0
+        self.bytes = 0
+        self.errors = 0
+
+class RequestStats:
+    def __init__(self):
+        self.latency = Histogram()
+        self.bytes = 0
+
+class StatsRegistry:
+    """Thread-safe collector for query and request metrics"""
+
+    def __init__(self, slow_threshold=SLOW_QUERY_SECONDS):
+        self.slow_threshold = slow_threshold
+        self._lock = threading.Lock()
+        self._queries = {}
+        self._requests = {}
+        self._slow = deque(maxlen=MAX_SLOW_QUERIES)
+        # Set by the app from its server's dialect, see query_shape()
+        self.double_quoted_strings = False
+
+    def record_query(self, sql, seconds, rows=0, nbytes=0, error=False, explain=None):
+        """explain, if given, is called for slow queries and should return the plan"""
+        shape = query_shape(sql, self.double_quoted_strings)
+        plan = None
+        if seconds >= self.slow_threshold and explain is not None:
+            try:
+                plan = explain()
+            except Exception as e:
+                plan = f'EXPLAIN failed: {e}'
+        with self._lock:
+            stats = self._queries.get(shape)
+            if stats is None:
+                if len(self._queries) >= MAX_SHAPES:
+                    shape = 'other'
+                stats = self._queries.setdefault(shape, QueryShapeStats(shape))
+            stats.latency.observe(seconds)
+            stats.rows += rows or 0
+            stats.bytes += nbytes or 0
+            stats.errors += int(error)
+            if seconds >= self.slow_threshold:
+                self._slow.append({'time': time.time(), 'shape': shape, 'sql': sql,
+                                   'seconds': seconds, 'rows': rows, 'plan': plan})
+
+    def record_query_bytes(self, sql, nbytes):
+        """Adds bytes fetched after the fact to a query already recorded"""
+        shape = query_shape(sql, self.double_quoted_strings)
+        with self._lock:
+            stats = self._queries.get(shape) or self._queries.get('other')
+            if stats is not None:
+                stats.bytes += nbytes
+
+    def record_request(self, method, route, status, seconds, nbytes=0):
+        key = (method, route, str(status))
+        with self._lock:
+            stats = self._requests.setdefault(key, RequestStats())
+            stats.latency.observe(seconds)
+            stats.bytes += nbytes or 0
+
+    def query_summary(self):
+        with self._lock:
+            return [{
+                'shape': stats.shape,
+                'calls': stats.latency.count,
+                'total_seconds': stats.latency.sum,
+                'avg_seconds': stats.latency.sum / stats.latency.count,
+                'p50_seconds': stats.latency.quantile(0.5),
+                'p99_seconds': stats.latency.quantile(0.99),
+                'rows': stats.rows,
+                'bytes': stats.bytes,
+                'errors': stats.errors
+            } for stats in self._queries.values() if stats.latency.count]
+
+    def slow_queries(self):
+        with self._lock:
+            return list(self._slow)
+
+    def reset(self):
+        with self._lock:
+            self._queries.clear()
+            self._requests.clear()
+            self._slow.clear()
+
+    def render_prometheus(self):
+        """Metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            lines += _histogram_lines(
+                'db_query_duration_seconds', 'SQL execution time by query shape',
+                [({'shape': s.shape}, s.latency) for s in self._queries.values()])
+            for name, attr, help_text in (
+                    ('db_query_rows_total', 'rows', 'Rows returned or affected by query shape'),
+                    ('db_query_bytes_total', 'bytes', 'Estimated result bytes by query shape'),
+                    ('db_query_errors_total', 'errors', 'Failed executions by query shape')):
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+                lines += [f'{name}{_labels({"shape": s.shape})} {getattr(s, attr)}'
+                          for s in self._queries.values()]
+            lines += _histogram_lines(
+                'http_request_duration_seconds', 'HTTP request time by route',
+                [({'method': m, 'route': r, 'status': c}, s.latency)
+                 for (m, r, c), s in self._requests.items()])
+            lines += ['# HELP http_response_bytes_total Response body bytes by route',
+                      '# TYPE http_response_bytes_total counter']
+            lines += [f'http_response_bytes_total'
+                      f'{_labels({"method": m, "route": r, "status": c})} {s.bytes}'
+                      for (m, r, c), s in self._requests.items()]
+        return '\n'.join(lines) + '\n'
+
+def _labels(labels):
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for value in labels.values())
+    return '{' + ','.join(f'{key}="{value}"' for key, value in zip(labels, escaped)) + '}'
+
+def _histogram_lines(name, help_text, series):
+    lines = [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+    for labels, histogram in series:
+        cumulative = 0
+        for bound, count in zip(histogram.buckets + (float('inf'),), histogram.counts):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f'{name}_bucket{_labels(dict(labels, le=le))} {cumulative}')
+        lines.append(f'{name}_sum{_labels(labels)} {histogram.sum}')
+        lines.append(f'{name}_count{_labels(labels)} {histogram.count}')
+    return lines
+
+# Process-wide registry used by both applications
+registry = StatsRegistry()